@@ -1,17 +1,30 @@
 # app.py - Complete updated version with Vercel Cron Job
-from flask import Flask, render_template, request, jsonify, send_from_directory
+from flask import Flask, render_template, request, jsonify, send_from_directory, Response, stream_with_context
 from flask_cors import CORS
-from crewai import Agent, Task, Crew, LLM
+from crewai import Agent, Task, Crew
 import os
-from datetime import datetime
+import json
+import queue
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 import traceback
+import uuid
+import requests
 from dotenv import load_dotenv
+from googleapiclient.errors import HttpError
 
 # Import your modules
 from crewai_modules.searcher import Searcher
 from crewai_modules.summarizer import Summarizer
 from crewai_modules.spreadsheet_writer import SpreadsheetWriter
 from crewai_modules.slack_sender import SlackSender
+from crewai_modules.agent_pool import AgentPool, SharedClients, PoolExhaustedError
+from crewai_modules.research_prefetch import ResearchPrefetcher
+from crewai_modules.outbox import Outbox
+from crewai_modules.streaming import HeadlineStreamParser, token_router
+from crewai_modules.llm_cache import LLMCache, CachedLLM
+from crewai_modules.sheet_exporter import SheetExporter, FORMATS as EXPORT_FORMATS, parquet_available
 
 load_dotenv()
 
@@ -20,21 +33,111 @@ CORS(app)
 
 # Configuration
 SPREADSHEET_ID = "1Ol0Fi9OE-DX78E_187x3BGggQm2LeRTbawmJm3tgF5o"
+AGENT_POOL_SIZE = int(os.getenv("AGENT_POOL_SIZE", "4"))
+AGENT_POOL_TIMEOUT = float(os.getenv("AGENT_POOL_TIMEOUT", "300"))
+CRON_HOUR_UTC = 9
+CRON_MAX_WORKERS = int(os.getenv("CRON_MAX_WORKERS", str(AGENT_POOL_SIZE)))
+# Off by default on Vercel: frozen instances never drain, and /tmp is not shared.
+# Enable only with OUTBOX_PATH on persistent storage (see crewai_modules/outbox.py)
+OUTBOX_ENABLED = os.getenv("OUTBOX_ENABLED", "false" if os.getenv("VERCEL") else "true").lower() == "true"
+OUTBOX_CRON_FLUSH_TIMEOUT = float(os.getenv("OUTBOX_CRON_FLUSH_TIMEOUT", "60"))
+EXPORT_SHEET_NAME = os.getenv("EXPORT_SHEET_NAME", "Sheet1")
+
+# Cron topics per weekday slot (0 = Monday). Override with CRON_TOPICS (JSON)
+# or CRON_TOPICS_FILE, e.g. {"monday": ["AI Breakthroughs", "Robotics"], "default": ["Tech News"]}
+DEFAULT_CRON_TOPICS = {
+    0: ["Artificial Intelligence Breakthroughs"],
+    1: ["Climate Change and Sustainability"],
+    2: ["Space Exploration Discoveries"],
+    3: ["Healthcare and Medical Innovations"],
+    4: ["Technology and Business Trends"],
+    5: ["Science and Research Updates"],
+    6: ["Future Technology Predictions"]
+}
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+def load_cron_topics():
+    """Load and validate the weekday -> [topics] map, falling back to the defaults
+    
+    Raises ValueError naming the offending entry, so a bad CRON_TOPICS stops
+    the app at startup instead of failing the 9:00 run.
+    """
+    raw = os.getenv("CRON_TOPICS")
+    source = "CRON_TOPICS"
+    topics_file = os.getenv("CRON_TOPICS_FILE")
+    if not raw and topics_file:
+        source = topics_file
+        with open(topics_file, "r") as f:
+            raw = f.read()
+    if not raw:
+        return dict(DEFAULT_CRON_TOPICS)
+    
+    try:
+        config = json.loads(raw)
+    except ValueError as e:
+        raise ValueError(f"{source} is not valid JSON: {e}")
+    if not isinstance(config, dict):
+        raise ValueError(f"{source} must be a JSON object of day -> topics")
+    
+    topics = {}
+    for key, value in config.items():
+        name = str(key).strip().lower()
+        if name in WEEKDAYS:
+            day = WEEKDAYS.index(name)
+        elif name == "default":
+            day = name
+        elif name.isdigit() and int(name) < 7:
+            day = int(name)
+        else:
+            raise ValueError(f"{source}: unknown day '{key}' (use monday-sunday, 0-6 or default)")
+        
+        value = [value] if isinstance(value, str) else value
+        if not isinstance(value, list) or not value or not all(isinstance(t, str) and t.strip() for t in value):
+            raise ValueError(f"{source}: '{key}' must be a topic or a non-empty list of topics")
+        topics[day] = [t.strip() for t in value]
+    return topics
+
+CRON_TOPICS = load_cron_topics()
+
+def topics_for_slot(slot_date):
+    """All topics scheduled for the 9:00 UTC run on the given date"""
+    return CRON_TOPICS.get(slot_date.weekday()) or CRON_TOPICS.get("default") or ["Latest Technology News"]
+
+def upcoming_slot(now=None):
+    """Date of the next scheduled cron run"""
+    now = now or datetime.utcnow()
+    if now.hour < CRON_HOUR_UTC:
+        return now.date()
+    return (now + timedelta(days=1)).date()
+
+# Failures that say something about the member's clients rather than the topic.
+# LLM provider errors come from litellm/groq, so those are matched by name.
+INFRASTRUCTURE_ERRORS = (OSError, requests.exceptions.RequestException, HttpError)
+INFRASTRUCTURE_ERROR_NAMES = ("Connection", "Timeout", "Authentication", "PermissionDenied", "ServiceUnavailable")
+
+def is_infrastructure_error(error):
+    if isinstance(error, INFRASTRUCTURE_ERRORS):
+        return True
+    return any(name in type(error).__name__ for name in INFRASTRUCTURE_ERROR_NAMES)
 
 class HeadlineGenerator:
-    def __init__(self):
-        # Initialize all tools
-        self.search_tool = Searcher()
-        self.summarizer_tool = Summarizer()
-        self.spreadsheet_writer = SpreadsheetWriter()
-        self.slack_sender = SlackSender()
-        
-        # Initialize LLM
-        self.gemini_llm = LLM(
-            model="gemini-3-flash-preview",
+    def __init__(self, clients=None, outbox=None, llm_cache=None):
+        # Initialize all tools (thread-safe clients are shared when provided;
+        # with an outbox, Sheets and Slack deliveries are queued write-behind)
+        clients = clients or SharedClients()
+        self.search_tool = Searcher(session=clients.http_session())
+        self.summarizer_tool = Summarizer(client=clients.groq_client(), cache=llm_cache)
+        self.spreadsheet_writer = SpreadsheetWriter(credentials=clients.google_credentials(), outbox=outbox)
+        self.slack_sender = SlackSender(session=clients.http_session(), outbox=outbox)
+        
+        # Initialize LLM (responses go through the prompt/response cache)
+        self.gemini_llm = CachedLLM(
+            model="gemini/gemini-3-flash-preview",  # litellm needs the provider prefix
             temperature=0.7,
-            base_url="https://generativelanguage.googleapis.com/v1beta",
-            api_key=os.getenv("GEMINI_API_KEY")
+            base_url=os.getenv("GEMINI_BASE_URL", "https://generativelanguage.googleapis.com/v1beta"),
+            api_key=os.getenv("GEMINI_API_KEY"),
+            stream=token_router.available,  # Token events for /api/generate/stream; kickoff() still returns the full text
+            cache=llm_cache
         )
         
         # Create headline agent
@@ -49,23 +152,49 @@ class HeadlineGenerator:
             llm=self.gemini_llm,
             allow_delegation=False
         )
+        
+        # Set when a run fails on the network, auth or Sheets rather than the topic
+        self.infrastructure_error = None
 
-    def generate_headline(self, topic):
-        """Generate headline and distribute through all channels"""
+    def is_healthy(self):
+        """Pool health check: the last run did not fail on an infrastructure error"""
+        return self.infrastructure_error is None
+
+    def generate_headline(self, topic, research=None):
+        """Generate headline and distribute through all channels
+        
+        If ``research`` notes are given (from the prefetch cron), the research
+        task is skipped and the crew only composes and delivers.
+        """
         try:
             print(f"🔍 Starting process for topic: {topic}")
             
-            # TASK 1: Research and create headline
-            search_task = Task(
-                description=f"""Research '{topic}' thoroughly. Find 3-5 recent, credible sources.
-                              Focus on facts, statistics, and current developments from the past month.""",
-                expected_output="List of sources with URLs and key facts.",
-                agent=self.headline_agent
-            )
+            # Outbox idempotency keys are per run, so a repeated headline is still delivered
+            run_id = uuid.uuid4().hex
+            self.spreadsheet_writer.run_id = run_id
+            self.slack_sender.run_id = run_id
+            
+            if research:
+                # Research was prefetched ahead of the scheduled run
+                search_task = None
+                research_intro = f"""Use these pre-fetched research notes about '{topic}'
+                              (already verified - do not search again):
+                              {research}
+                              
+                              """
+            else:
+                # TASK 1: Research and create headline
+                search_task = Task(
+                    description=f"""Research '{topic}' thoroughly. Find 3-5 recent, credible sources.
+                                  Focus on facts, statistics, and current developments from the past month.""",
+                    expected_output="List of sources with URLs and key facts.",
+                    agent=self.headline_agent
+                )
+                research_intro = ""
             
             # TASK 2: Create formatted headline with key points
             headline_task = Task(
-                description=f"""Based on your research, create:
+                description=research_intro + f"""Based on your research, create:
                               1. A compelling headline (8-15 words max)
                               2. 3-5 key supporting facts as bullet points
                               3. Save everything to Google Sheets
@@ -78,23 +207,25 @@ class HeadlineGenerator:
                               • [Fact 3]""",
                 expected_output="Formatted headline with key points, saved to spreadsheet.",
                 agent=self.headline_agent,
-                context=[search_task]
+                context=[search_task] if search_task else []
             )
             
-            # TASK 3: Send to Slack
+            # TASK 3: Final copy for Slack (delivered by generate_headline, not a tool)
             slack_task = Task(
-                description=f"""Send the generated headline about '{topic}' to Slack.
-                              Include: headline, topic, key points, and link to spreadsheet.
-                              Format it professionally for team communication.""",
-                expected_output="Confirmation of Slack delivery.",
+                description=f"""Prepare the final Slack update about '{topic}'.
+                              Repeat the headline and key points in the EXACT format above
+                              (HEADLINE: ... / KEY POINTS: • ...). It is posted to Slack
+                              automatically once you answer.""",
+                expected_output="The final headline and key points in the HEADLINE / KEY POINTS format.",
                 agent=self.headline_agent,
                 context=[headline_task]
             )
             
             # Run the crew
+            tasks = [search_task, headline_task, slack_task] if search_task else [headline_task, slack_task]
             crew = Crew(
                 agents=[self.headline_agent],
-                tasks=[search_task, headline_task, slack_task],
+                tasks=tasks,
                 verbose=True
             )
             
@@ -105,8 +236,8 @@ class HeadlineGenerator:
             # Parse the results
             parsed_data = self._parse_output(result_str)
             
-            # Extract Slack status
-            slack_status = "Sent" if "successfully" in result_str.lower() else "Pending"
+            # Deliver to Slack from the parsed result; the status reflects what actually happened
+            slack_status = self._deliver_to_slack(topic, parsed_data)
             
             return {
                 "success": True,
@@ -123,6 +254,9 @@ class HeadlineGenerator:
         except Exception as e:
             print(f"❌ Error: {str(e)}")
             traceback.print_exc()
+            if is_infrastructure_error(e):
+                # The pool discards this member on release and builds fresh clients
+                self.infrastructure_error = f"{type(e).__name__}: {e}"
             return {
                 "success": False,
                 "error": str(e),
@@ -130,6 +264,61 @@ class HeadlineGenerator:
                 "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             }
 
+    def _deliver_to_slack(self, topic, parsed_data):
+        """Send (or queue, with the outbox) the parsed headline; returns the Slack status"""
+        headline = parsed_data.get("headline")
+        if not headline:
+            return "Skipped"
+        if not self.slack_sender.webhook_url:
+            return "Not configured"
+        sources = "\n".join(f"• {point}" for point in parsed_data.get("key_points", []))
+        try:
+            if self.slack_sender.outbox is not None:
+                # Queued rows are confirmed by /api/outbox/status
+                self.slack_sender.enqueue(headline, topic, sources)
+                return "Queued"
+            self.slack_sender._send(headline, topic, sources)
+            return "Sent"
+        except Exception as e:
+            print(f"❌ Slack delivery failed: {str(e)}")
+            return "Failed"
+
+    def stream_headline(self, topic, research=None):
+        """Run generate_headline while yielding (event, data) tuples as tokens arrive
+        
+        Yields "headline" and "key_point" events as soon as each line is complete,
+        then a final "result" event with the same payload generate_headline returns.
+        """
+        events = queue.Queue()
+        parser = HeadlineStreamParser()
+        
+        def run():
+            # Subscribed on the kickoff thread, so the router can verify chunk order
+            with token_router.subscribe(self.gemini_llm, lambda chunk: events.put(("chunk", chunk))):
+                result = self.generate_headline(topic, research=research)
+            events.put(("result", result))
+        
+        worker = threading.Thread(target=run, daemon=True)
+        worker.start()
+        try:
+            yield "status", {"stage": "started", "topic": topic, "token_streaming": token_router.available}
+            while True:
+                kind, payload = events.get()
+                if kind == "chunk":
+                    parsed = parser.feed(payload) if payload is not None else parser.end_segment()
+                    for event, value in parsed:
+                        yield event, {"value": value}
+                    continue
+                
+                for event, value in parser.close():
+                    yield event, {"value": value}
+                yield "result", payload
+                break
+        finally:
+            # If the client disconnects, wait for the crew so this generator
+            # is not handed back to the pool while it is still running
+            worker.join()
+
     def _parse_output(self, output):
         """Parse the agent output for clean data"""
         lines = output.split('\n')
@@ -167,8 +356,33 @@ class HeadlineGenerator:
         
         return data
 
-# Initialize the generator
-headline_generator = HeadlineGenerator()
+# Initialize the agent pool - each concurrent request checks out its own generator
+shared_clients = SharedClients(max_connections=AGENT_POOL_SIZE * 2)
+
+# Prompt/response cache for Gemini and Groq (LLM_CACHE_MODE: off, on, record, replay)
+llm_cache = LLMCache()
+
+# Durable outbox: tools enqueue, background drainers deliver to Sheets and Slack
+outbox = None
+if OUTBOX_ENABLED:
+    outbox = Outbox()
+    outbox.register("sheets", SpreadsheetWriter(credentials=shared_clients.google_credentials()).deliver_payload)
+    outbox.register("slack", SlackSender(session=shared_clients.http_session()).deliver_payload)
+    outbox.start()
+
+agent_pool = AgentPool(
+    factory=lambda: HeadlineGenerator(shared_clients, outbox=outbox, llm_cache=llm_cache),
+    size=AGENT_POOL_SIZE,
+    health_check=lambda generator: generator.is_healthy(),
+    checkout_timeout=AGENT_POOL_TIMEOUT
+)
+agent_pool.warm(1)
+
+# Research for the upcoming cron slot is fetched ahead of time (see /api/cron/prefetch)
+research_prefetcher = ResearchPrefetcher(
+    searcher=Searcher(session=shared_clients.http_session()),
+    summarizer=Summarizer(client=shared_clients.groq_client(), cache=llm_cache)
+)
 
 # ============================================================================
 # FLASK ROUTES
@@ -200,7 +414,8 @@ def generate():
             }), 400
         
         print(f"📨 API Request - Topic: {topic}")
-        result = headline_generator.generate_headline(topic)
+        with agent_pool.checkout() as headline_generator:
+            result = headline_generator.generate_headline(topic)
         
         # Log the result
         if result["success"]:
@@ -210,6 +425,12 @@ def generate():
         
         return jsonify(result)
         
+    except PoolExhaustedError as e:
+        print(f"⏳ {str(e)}")
+        return jsonify({
+            "success": False,
+            "error": "Server busy, please retry shortly"
+        }), 503
     except Exception as e:
         error_msg = f"Server error: {str(e)}"
         print(f"🔥 {error_msg}")
@@ -218,6 +439,39 @@ def generate():
             "error": error_msg
         }), 500
 
+@app.route('/api/generate/stream', methods=['POST'])
+def generate_stream():
+    """Generate a headline, streaming the headline and key points as Server-Sent Events"""
+    data = request.json
+    topic = (data or {}).get('topic', '').strip()
+    if not topic:
+        return jsonify({
+            "success": False,
+            "error": "Topic is required"
+        }), 400
+    
+    print(f"📨 Streaming API Request - Topic: {topic}")
+    
+    def sse(event, payload):
+        return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+    
+    def events():
+        try:
+            with agent_pool.checkout() as headline_generator:
+                for event, payload in headline_generator.stream_headline(topic):
+                    yield sse(event, payload)
+        except PoolExhaustedError:
+            yield sse("error", {"success": False, "error": "Server busy, please retry shortly"})
+        except Exception as e:
+            print(f"🔥 Streaming error: {str(e)}")
+            yield sse("error", {"success": False, "error": f"Server error: {str(e)}"})
+    
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream',
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.route('/api/health')
 def health():
     """Health check endpoint"""
@@ -231,8 +485,13 @@ def health():
             "google_sheets": True,
             "search": True,
             "summarization": True,
-            "cron_job": True
+            "cron_job": True,
+            "outbox": outbox is not None,
+            "streaming": token_router.available
         },
+        "agent_pool": agent_pool.stats(),
+        "outbox_backlog": outbox.metrics()["backlog"] if outbox else None,
+        "llm_cache": llm_cache.stats(),
         "spreadsheet_link": f"https://docs.google.com/spreadsheets/d/{SPREADSHEET_ID}/edit"
     })
 
@@ -240,76 +499,144 @@ def health():
 # CRON JOB ENDPOINTS
 # ============================================================================
 
+def run_cron_topic(topic, slot):
+    """Generate one scheduled headline, using prefetched research when available"""
+    record = research_prefetcher.get(topic, slot)
+    research = ResearchPrefetcher.format_notes(record) if record else None
+    if not research:
+        print(f"⚠️ No prefetched research for '{topic}' on {slot.isoformat()} in {research_prefetcher.cache_dir} - "
+              f"running live research. Did /api/cron/prefetch run, and is PREFETCH_DIR shared storage?")
+    print(f"📰 Cron topic: {topic} ({'prefetched research' if research else 'live research'})")
+    
+    with agent_pool.checkout() as headline_generator:
+        result = headline_generator.generate_headline(topic, research=research)
+    result["prefetched"] = bool(research)
+    return result
+
+@app.route('/api/cron/prefetch', methods=['GET', 'POST'])
+def prefetch_cron():
+    """Vercel Cron Job endpoint - warms research for the upcoming 9 AM UTC slot"""
+    if os.getenv("VERCEL") and not os.getenv("PREFETCH_DIR"):
+        # /tmp is per instance: the 9:00 run would never see the research, and
+        # the Serper/Groq calls would be wasted
+        print("🔥 PREFETCH REFUSED: PREFETCH_DIR is not set on Vercel")
+        return jsonify({
+            "success": False,
+            "error": "PREFETCH_DIR must point at storage shared by all instances when running on Vercel",
+            "timestamp": datetime.now().isoformat()
+        }), 500
+    
+    try:
+        slot = upcoming_slot()
+        topics = topics_for_slot(slot)
+        
+        print(f"🔭 Prefetching {len(topics)} topic(s) for slot {slot.isoformat()}")
+        results = research_prefetcher.prefetch_many(topics, slot, max_workers=CRON_MAX_WORKERS)
+        
+        return jsonify({
+            "success": True,
+            "slot": slot.isoformat(),
+            "topics": topics,
+            "prefetched": len([r for r in results if r["success"]]),
+            "results": results,
+            "timestamp": datetime.now().isoformat()
+        })
+    except Exception as e:
+        print(f"🔥 PREFETCH ERROR: {str(e)}")
+        return jsonify({
+            "success": False,
+            "error": str(e),
+            "timestamp": datetime.now().isoformat()
+        }), 500
+
 @app.route('/api/cron/daily-headline', methods=['GET', 'POST'])
 def daily_headline_cron():
     """Vercel Cron Job endpoint - runs daily at 9 AM UTC"""
     try:
-        from datetime import datetime
-        import random
-        
-        # Topics database - rotates based on day of week
-        topics_by_day = {
-            0: "Artificial Intelligence Breakthroughs",  # Monday
-            1: "Climate Change and Sustainability",      # Tuesday
-            2: "Space Exploration Discoveries",          # Wednesday
-            3: "Healthcare and Medical Innovations",     # Thursday
-            4: "Technology and Business Trends",         # Friday
-            5: "Science and Research Updates",           # Saturday
-            6: "Future Technology Predictions"           # Sunday
-        }
-        
-        # Get current day and select topic
-        current_day = datetime.now().weekday()
-        topic = topics_by_day.get(current_day, "Latest Technology News")
+        # The slot being served is today's 9:00 run
+        slot = datetime.utcnow().date()
+        topics = topics_for_slot(slot)
         
         print("=" * 60)
         print(f"⏰ VERCEL CRON JOB TRIGGERED")
         print(f"📅 Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"📰 Topic: {topic}")
+        print(f"📰 Topics: {', '.join(topics)}")
         print(f"🌍 Timezone: UTC (9:00 AM)")
         print("=" * 60)
         
-        # Generate the headline
-        result = headline_generator.generate_headline(topic)
-        
-        # Create a simple log entry
-        log_entry = {
+        # Generate all headlines for the slot in parallel (one pool member each)
+        with ThreadPoolExecutor(max_workers=max(1, min(CRON_MAX_WORKERS, len(topics)))) as pool:
+            futures = [pool.submit(run_cron_topic, topic, slot) for topic in topics]
+        
+        results = []
+        exhausted = []
+        for topic, future in zip(topics, futures):
+            try:
+                results.append(future.result())
+            except PoolExhaustedError as e:
+                print(f"⏳ Cron topic '{topic}' got no agent: {str(e)}")
+                exhausted.append(topic)
+                results.append({"success": False, "topic": topic, "error": str(e)})
+            except Exception as e:
+                print(f"❌ Cron topic '{topic}' failed: {str(e)}")
+                results.append({"success": False, "topic": topic, "error": str(e)})
+        
+        # Deliver queued Sheets/Slack writes before the serverless invocation ends
+        if outbox:
+            outbox.flush(timeout=OUTBOX_CRON_FLUSH_TIMEOUT)
+        
+        # Create a simple log entry per topic
+        log_entries = [{
             "timestamp": datetime.now().isoformat(),
             "cron_job": True,
             "topic": topic,
             "success": result.get("success", False),
             "headline": result.get("headline", "")[:100] + "..." if result.get("headline") else None,
             "slack_status": result.get("slack_status", "Unknown"),
+            "prefetched": result.get("prefetched", False),
             "trigger": "vercel-cron"
-        }
+        } for topic, result in zip(topics, results)]
         
         # Save log to a file (persists between deployments on Vercel)
         try:
             with open('/tmp/cron_log.jsonl', 'a') as f:
-                import json
-                f.write(json.dumps(log_entry) + '\n')
+                for log_entry in log_entries:
+                    f.write(json.dumps(log_entry) + '\n')
         except:
             # If file write fails, just print
-            print(f"📝 Log entry: {json.dumps(log_entry)}")
+            for log_entry in log_entries:
+                print(f"📝 Log entry: {json.dumps(log_entry)}")
         
-        # Return success response
+        # Return success response (503 when topics were skipped for lack of an agent)
         return jsonify({
-            "success": True,
-            "message": "Daily headline automation completed",
+            "success": not exhausted,
+            "message": "Daily headline automation completed" if not exhausted
+                       else f"Agent pool exhausted; skipped: {', '.join(exhausted)}",
             "execution_time": datetime.now().isoformat(),
-            "topic": topic,
+            "topic": topics[0],
+            "topics": topics,
             "result_summary": {
-                "headline_generated": result.get("success", False),
-                "slack_notification": result.get("slack_status", "Unknown"),
-                "spreadsheet_updated": True if result.get("success") else False
+                "headline_generated": all(r.get("success", False) for r in results),
+                "headlines_generated": len([r for r in results if r.get("success")]),
+                "prefetched": len([r for r in results if r.get("prefetched")]),
+                "slack_notification": results[0].get("slack_status", "Unknown"),
+                "spreadsheet_updated": any(r.get("success") for r in results)
             },
+            "results": [{
+                "topic": r.get("topic"),
+                "success": r.get("success", False),
+                "headline": r.get("headline"),
+                "slack_status": r.get("slack_status", "Unknown"),
+                "error": r.get("error")
+            } for r in results],
             "next_scheduled_run": "Tomorrow at 09:00 UTC",
             "vercel_cron": {
                 "schedule": "0 9 * * *",
+                "prefetch_schedule": "30 8 * * *",
                 "timezone": "UTC",
                 "job_id": "daily-headline-generation"
             }
-        })
+        }), 503 if exhausted else 200
         
     except Exception as e:
         error_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -396,6 +723,7 @@ def cron_status():
             "recent_executions": recent_executions[-5:],  # Last 5
             "endpoints": {
                 "cron_job": "/api/cron/daily-headline",
+                "prefetch": "/api/cron/prefetch",
                 "test": "/api/cron/test",
                 "manual_trigger": "/api/automation/trigger (POST)"
             },
@@ -417,18 +745,13 @@ def trigger_automation():
         if custom_topic:
             topic = custom_topic
         else:
-            # Use the same logic as cron job
-            from datetime import datetime
-            topics_by_day = {
-                0: "AI News", 1: "Climate", 2: "Space", 3: "Health",
-                4: "Business", 5: "Science", 6: "Future Tech"
-            }
-            current_day = datetime.now().weekday()
-            topic = topics_by_day.get(current_day, "Technology Updates")
+            # First topic of today's cron slot
+            topic = topics_for_slot(datetime.utcnow().date())[0]
         
         print(f"🔧 Manual trigger for topic: {topic}")
         
-        result = headline_generator.generate_headline(topic)
+        with agent_pool.checkout() as headline_generator:
+            result = headline_generator.generate_headline(topic)
         
         return jsonify({
             "success": True,
@@ -439,6 +762,11 @@ def trigger_automation():
             "note": "This was manually triggered. Cron job runs daily at 9 AM UTC."
         })
         
+    except PoolExhaustedError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 503
     except Exception as e:
         return jsonify({
             "success": False,
@@ -454,7 +782,7 @@ def test_slack():
         test_topic = data.get('topic', 'System Test')
         
         from crewai_modules.slack_sender import SlackSender
-        slack = SlackSender()
+        slack = SlackSender(session=shared_clients.http_session())
         result = slack._run(test_headline, test_topic, "This is a test message from the API.")
         
         return jsonify({
@@ -469,6 +797,105 @@ def test_slack():
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
+# ============================================================================
+# EXPORT ENDPOINT
+# ============================================================================
+
+@app.route('/api/export', methods=['GET'])
+def export_headlines():
+    """Stream the headline history from Google Sheets as CSV, NDJSON or Parquet
+    
+    Query params: format, sheet, start_row (resume offset), date_from, date_to
+    (YYYY-MM-DD), topic (substring match) and page_size (1-5000).
+    """
+    fmt = request.args.get('format', 'csv').lower()
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({
+            "success": False,
+            "error": f"Unsupported format '{fmt}'. Use one of: {', '.join(EXPORT_FORMATS)}"
+        }), 400
+    if fmt == 'parquet' and not parquet_available():
+        return jsonify({"success": False, "error": "Parquet export requires pyarrow"}), 400
+    
+    try:
+        start_row = int(request.args.get('start_row', 2))
+        page_size = request.args.get('page_size')  # Validated (1-5000) by SheetExporter
+        exporter = SheetExporter(credentials=shared_clients.google_credentials(), page_size=page_size)
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    
+    sheet_name = request.args.get('sheet', EXPORT_SHEET_NAME)
+    try:
+        # Reads the sheet's metadata now, so failures get a real status code
+        chunks = exporter.export(
+            fmt,
+            sheet_name,
+            start_row=start_row,
+            date_from=request.args.get('date_from'),
+            date_to=request.args.get('date_to'),
+            topic=request.args.get('topic')
+        )
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    except HttpError as e:
+        # Sheets rejects unknown sheet names with a 4xx; pass those through
+        status = int(e.resp.status)
+        print(f"🔥 Export of '{sheet_name}' failed: {str(e)}")
+        return jsonify({"success": False, "error": str(e)}), status if 400 <= status < 500 else 502
+    except Exception as e:
+        print(f"🔥 Export of '{sheet_name}' failed: {str(e)}")
+        return jsonify({"success": False, "error": str(e)}), 500
+    
+    def stream():
+        try:
+            yield from chunks
+        except Exception as e:
+            # Headers are already sent - log it; the client sees a truncated body
+            print(f"🔥 Export of '{sheet_name}' failed mid-stream: {str(e)}")
+            raise
+    
+    print(f"📤 Export requested - sheet: {sheet_name}, format: {fmt}, start_row: {start_row}")
+    filename = f"headlines-{datetime.now().strftime('%Y%m%d')}.{fmt}"
+    return Response(
+        stream_with_context(stream()),
+        mimetype=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+# ============================================================================
+# OUTBOX ENDPOINTS
+# ============================================================================
+
+@app.route('/api/outbox/status', methods=['GET'])
+def outbox_status():
+    """Backlog metrics for queued Sheets and Slack deliveries"""
+    if not outbox:
+        return jsonify({"enabled": False})
+    try:
+        return jsonify({"enabled": True, **outbox.metrics()})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/outbox/flush', methods=['POST'])
+def outbox_flush():
+    """Deliver everything queued now (optionally requeueing dead deliveries first)"""
+    if not outbox:
+        return jsonify({"success": False, "error": "Outbox is disabled"}), 400
+    try:
+        data = request.json or {}
+        requeued = outbox.retry_dead(data.get("channel")) if data.get("retry_dead") else 0
+        channels = [data["channel"]] if data.get("channel") else None
+        metrics = outbox.flush(timeout=float(data.get("timeout", 30)), channels=channels)
+        
+        return jsonify({
+            "success": metrics["backlog"] == 0,
+            "requeued": requeued,
+            **metrics,
+            "timestamp": datetime.now().isoformat()
+        })
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
 @app.route('/static/<path:path>')
 def serve_static(path):
     return send_from_directory('static', path)
@@ -501,9 +928,11 @@ if __name__ == '__main__':
     port = int(os.getenv('PORT', 5000))
     debug = os.getenv('FLASK_DEBUG', 'False').lower() == 'true'
     
-    print(f"\n🌐 Starting server on port {port}")
+    print(f"\n🧵 Agent pool size: {AGENT_POOL_SIZE}")
+    print(f"🗄️ LLM cache mode: {llm_cache.mode}")
+    print(f"🌐 Starting server on port {port}")
     print(f"📁 Static folder: {app.static_folder}")
     print(f"📁 Templates folder: {app.template_folder}")
     print("=" * 50)
     
-    app.run(debug=debug, host='0.0.0.0', port=port)
\ No newline at end of file
+    app.run(debug=debug, host='0.0.0.0', port=port, threaded=True)
\ No newline at end of file
@@ -0,0 +1,475 @@
+# benchmarks/fake_services.py - Local stand-ins for every external service
+"""
+In-process HTTP fakes for Serper, Gemini, Groq, Google Sheets v4 and a Slack
+webhook. Each fake listens on 127.0.0.1 with an ephemeral port, so the whole
+app can be exercised without network access. Latency and error injection are
+configured per service through ``FaultConfig``.
+"""
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, unquote
+
+
+# Canned composition in the exact format HeadlineGenerator._parse_output expects.
+# The "Final Answer:" prefix lets the crewai agent finish the task.
+CANNED_ANSWER = """Thought: I now can give a great answer
+Final Answer: HEADLINE: Local Benchmark Confirms Headline Pipeline Runs Offline
+KEY POINTS:
+• Every external dependency was replaced by a local stand-in
+• Latency and error rates were injected deterministically
+• The results were successfully sent to Slack and saved to Google Sheets"""
+
+# Scripted ReAct turns so generate/stream/cron drive the tools through the crew.
+# A step fires when its trigger phrase (from HeadlineGenerator's task
+# descriptions) is in the conversation and the action has not been taken yet;
+# once every step has run, the Gemini stub answers with CANNED_ANSWER.
+REACT_SCRIPT = [
+    ("Find 3-5 recent, credible sources", "Search Tool", {"query": "latest developments"}),
+    ("Save everything to Google Sheets", "Spreadsheet Writer Tool", {
+        "sheet_name": "Sheet1",
+        "headings": ["headline", "date", "sources", "topic"],
+        "data": {"headline": "Local Benchmark Confirms Headline Pipeline Runs Offline",
+                 "date": "2026-01-01", "sources": "https://example.com/bench", "topic": "bench"}
+    }),
+]
+
+
+def _conversation_text(body):
+    """Every message text of an OpenAI-style or Gemini-native request body"""
+    texts = []
+    for message in body.get("messages", []):
+        content = message.get("content")
+        texts.append(content if isinstance(content, str) else json.dumps(content))
+    for content in [body.get("systemInstruction") or {}] + body.get("contents", []):
+        texts.extend(part.get("text", "") for part in content.get("parts", []))
+    return "\n".join(texts)
+
+
+@dataclass
+class FaultConfig:
+    latency_ms: float = 0.0      # Base latency added to every response
+    jitter_ms: float = 0.0       # Uniform random extra latency (0..jitter_ms)
+    error_rate: float = 0.0      # Fraction of requests answered with error_status
+    error_status: int = 500
+
+    def apply(self):
+        """Sleep for the configured latency; return an error status or None"""
+        delay = self.latency_ms + random.uniform(0, self.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+        if self.error_rate and random.random() < self.error_rate:
+            return self.error_status
+        return None
+
+
+class FakeService:
+    """Base class: owns the HTTP server thread and request statistics"""
+
+    name = "fake"
+
+    def __init__(self, fault=None):
+        self.fault = fault or FaultConfig()
+        self.request_count = 0
+        self.error_count = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self):
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                service._dispatch(self, "GET")
+
+            def do_POST(self):
+                service._dispatch(self, "POST")
+
+            def do_PUT(self):
+                service._dispatch(self, "PUT")
+
+            def log_message(self, format, *args):
+                pass  # Keep benchmark output clean
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def stats(self):
+        with self._lock:
+            return {"requests": self.request_count, "injected_errors": self.error_count}
+
+    # ------------------------------------------------------------------
+    # Request handling
+    # ------------------------------------------------------------------
+
+    def _dispatch(self, handler, method):
+        parsed = urlparse(handler.path)
+        length = int(handler.headers.get("Content-Length") or 0)
+        raw = handler.rfile.read(length) if length else b""
+        try:
+            body = json.loads(raw) if raw else {}
+        except ValueError:
+            body = {}
+
+        with self._lock:
+            self.request_count += 1
+
+        error_status = self.fault.apply()
+        if error_status:
+            with self._lock:
+                self.error_count += 1
+            self._send(handler, error_status, {"error": {"code": error_status, "message": "Injected failure"}})
+            return
+
+        try:
+            result = self.handle(method, unquote(parsed.path), parse_qs(parsed.query), body)
+        except Exception as e:
+            self._send(handler, 500, {"error": {"code": 500, "message": str(e)}})
+            return
+
+        if result is None:
+            self._send(handler, 404, {"error": {"code": 404, "message": f"No route for {parsed.path}"}})
+        elif isinstance(result, tuple) and result[0] == "sse":
+            self._send_sse(handler, result[1])
+        else:
+            status, payload = result
+            self._send(handler, status, payload)
+
+    def _send(self, handler, status, payload):
+        data = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+        content_type = "text/plain" if isinstance(payload, bytes) else "application/json"
+        handler.send_response(status)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(data)))
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    def _send_sse(self, handler, events):
+        """Write a chunked text/event-stream response, one event per chunk"""
+        handler.send_response(200)
+        handler.send_header("Content-Type", "text/event-stream")
+        handler.send_header("Transfer-Encoding", "chunked")
+        handler.end_headers()
+        for event in events:
+            data = f"data: {json.dumps(event) if not isinstance(event, str) else event}\n\n".encode("utf-8")
+            handler.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+            handler.wfile.flush()
+            if self.fault.latency_ms:
+                # Spread the configured latency across tokens as well
+                time.sleep(self.fault.latency_ms / 1000.0 / 20)
+        handler.wfile.write(b"0\r\n\r\n")
+
+    def handle(self, method, path, query, body):
+        """Return (status, payload), ("sse", events) or None for 404"""
+        raise NotImplementedError
+
+
+def _token_chunks(text, size=12):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def _chat_completion(model, text):
+    return {
+        "id": "chatcmpl-bench",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": text},
+            "finish_reason": "stop"
+        }],
+        "usage": {"prompt_tokens": 100, "completion_tokens": len(text) // 4, "total_tokens": 100 + len(text) // 4}
+    }
+
+
+def _chat_completion_chunks(model, text):
+    events = []
+    for piece in _token_chunks(text):
+        events.append({
+            "id": "chatcmpl-bench",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]
+        })
+    events.append({
+        "id": "chatcmpl-bench",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]
+    })
+    events.append("[DONE]")
+    return events
+
+
+# ============================================================================
+# SERVICE STAND-INS
+# ============================================================================
+
+class SerperStub(FakeService):
+    """POST /search - Serper web search"""
+
+    name = "serper"
+
+    def handle(self, method, path, query, body):
+        if method != "POST" or not path.endswith("/search"):
+            return None
+        q = body.get("q", "")
+        organic = [{
+            "title": f"{q} - result {i}",
+            "link": f"https://example.com/{i}",
+            "snippet": f"Recent developments about {q}, item {i}."
+        } for i in range(1, int(body.get("num", 5)) + 1)]
+        return 200, {"searchParameters": {"q": q}, "organic": organic}
+
+
+class GeminiStub(FakeService):
+    """Gemini native generateContent/streamGenerateContent plus OpenAI-compatible chat"""
+
+    name = "gemini"
+
+    def __init__(self, fault=None, answer=CANNED_ANSWER, script=REACT_SCRIPT):
+        super().__init__(fault)
+        self.answer = answer
+        self.script = script
+
+    def _reply(self, body):
+        conversation = _conversation_text(body)
+        for trigger, tool, tool_input in self.script:
+            if trigger in conversation and f"Action: {tool}" not in conversation:
+                return (f"Thought: I should use the {tool}\n"
+                        f"Action: {tool}\n"
+                        f"Action Input: {json.dumps(tool_input)}")
+        return self.answer
+
+    def _candidate(self, text):
+        return {
+            "candidates": [{
+                "content": {"role": "model", "parts": [{"text": text}]},
+                "finishReason": "STOP",
+                "index": 0
+            }],
+            "usageMetadata": {"promptTokenCount": 100, "candidatesTokenCount": len(text) // 4,
+                              "totalTokenCount": 100 + len(text) // 4}
+        }
+
+    def handle(self, method, path, query, body):
+        if method != "POST":
+            return None
+        reply = self._reply(body)
+        if path.endswith(":generateContent"):
+            return 200, self._candidate(reply)
+        if path.endswith(":streamGenerateContent"):
+            return "sse", [self._candidate(piece) for piece in _token_chunks(reply)]
+        if path.endswith("/chat/completions"):
+            model = body.get("model", "gemini")
+            if body.get("stream"):
+                return "sse", _chat_completion_chunks(model, reply)
+            return 200, _chat_completion(model, reply)
+        return None
+
+
+class GroqStub(FakeService):
+    """POST /openai/v1/chat/completions - Groq's OpenAI-compatible API"""
+
+    name = "groq"
+
+    def handle(self, method, path, query, body):
+        if method != "POST" or not path.endswith("/chat/completions"):
+            return None
+        model = body.get("model", "llama")
+        summary = "Summary: the text describes recent developments in concise terms."
+        if body.get("stream"):
+            return "sse", _chat_completion_chunks(model, summary)
+        return 200, _chat_completion(model, summary)
+
+
+_RANGE_RE = re.compile(r"^(?:'(?P<quoted>(?:[^']|'')+)'|(?P<sheet>[^!]+))(?:!(?P<c1>[A-Z]*)(?P<r1>\d*)(?::(?P<c2>[A-Z]*)(?P<r2>\d*))?)?$")
+
+
+def _column_index(letters):
+    """A -> 0, Z -> 25, AA -> 26"""
+    index = 0
+    for letter in letters:
+        index = index * 26 + ord(letter) - ord("A") + 1
+    return index - 1
+
+
+class SheetsStub(FakeService):
+    """In-memory Google Sheets v4 API (values get/append/update/batchGet, spreadsheet metadata)"""
+
+    name = "sheets"
+
+    def __init__(self, fault=None):
+        super().__init__(fault)
+        self.sheets = {}  # sheet name -> list of rows
+        self._data_lock = threading.Lock()
+
+    def seed(self, sheet_name, rows):
+        with self._data_lock:
+            self.sheets[sheet_name] = [list(r) for r in rows]
+
+    def _parse_range(self, a1):
+        match = _RANGE_RE.match(a1)
+        if not match:
+            return a1, 1, None
+        sheet = match.group("sheet") or match.group("quoted").replace("''", "'")
+        start = int(match.group("r1")) if match.group("r1") else 1
+        end = int(match.group("r2")) if match.group("r2") else None
+        if match.group("r1") and match.group("c2") is None and not match.group("r2"):
+            end = start  # Single cell, e.g. "Sheet1!A5"
+        return sheet, start, end
+
+    def _read(self, a1):
+        sheet, start, end = self._parse_range(a1)
+        with self._data_lock:
+            rows = self.sheets.get(sheet, [])
+            selected = rows[start - 1:end] if end else rows[start - 1:]
+        payload = {"range": a1, "majorDimension": "ROWS"}
+        if selected:
+            payload["values"] = selected
+        return payload
+
+    def _properties(self, a1):
+        sheet, _, _ = self._parse_range(a1)
+        with self._data_lock:
+            if sheet not in self.sheets:
+                return None
+            # New sheets get a 1000-row grid; appends grow it
+            row_count = max(1000, len(self.sheets[sheet]))
+        return {"properties": {"title": sheet, "gridProperties": {"rowCount": row_count, "columnCount": 26}}}
+
+    def handle(self, method, path, query, body):
+        # GET /v4/spreadsheets/{id}?ranges=... - sheet metadata
+        if method == "GET" and re.fullmatch(r"/v4/spreadsheets/[^/]+", path):
+            sheets = [self._properties(r) for r in query.get("ranges", [])]
+            if None in sheets:
+                return 400, {"error": {"code": 400, "message": "Unable to parse range", "status": "INVALID_ARGUMENT"}}
+            return 200, {"sheets": sheets}
+
+        # /v4/spreadsheets/{id}/values/{range}[:append] or /values:batchGet
+        match = re.search(r"/v4/spreadsheets/[^/]+/values(?P<rest>.*)$", path)
+        if not match:
+            return None
+        rest = match.group("rest")
+
+        if method == "GET" and rest == ":batchGet":
+            return 200, {"valueRanges": [self._read(r) for r in query.get("ranges", [])]}
+
+        if method == "GET" and rest.startswith("/"):
+            return 200, self._read(rest[1:])
+
+        if method == "PUT" and rest.startswith("/"):
+            # Single-cell update, e.g. "Sheet1!E1" (used for the outbox_key heading)
+            sheet, row, _ = self._parse_range(rest[1:])
+            column = _column_index(_RANGE_RE.match(rest[1:]).group("c1") or "A")
+            value = (body.get("values") or [[""]])[0][0]
+            with self._data_lock:
+                rows = self.sheets.setdefault(sheet, [])
+                rows.extend([] for _ in range(row - len(rows)))
+                cells = rows[row - 1]
+                cells.extend([""] * (column + 1 - len(cells)))
+                cells[column] = value
+            return 200, {"updatedRange": rest[1:], "updatedCells": 1}
+
+        if method == "POST" and rest.endswith(":append"):
+            sheet, _, _ = self._parse_range(rest[1:-len(":append")])
+            values = body.get("values", [])
+            with self._data_lock:
+                rows = self.sheets.setdefault(sheet, [])
+                first = len(rows) + 1
+                rows.extend(values)
+                last = len(rows)
+            return 200, {
+                "updates": {
+                    "updatedRange": f"{sheet}!A{first}:Z{last}",
+                    "updatedRows": len(values)
+                }
+            }
+        return None
+
+
+class SlackStub(FakeService):
+    """POST /webhook - Slack incoming webhook"""
+
+    name = "slack"
+
+    def __init__(self, fault=None):
+        super().__init__(fault)
+        self.messages = []
+
+    def handle(self, method, path, query, body):
+        if method != "POST" or not path.startswith("/webhook"):
+            return None
+        with self._lock:
+            self.messages.append(body)
+        return 200, b"ok"
+
+
+# ============================================================================
+# WIRING
+# ============================================================================
+
+class FakeServices:
+    """Starts every stand-in and exposes the environment that points the app at them"""
+
+    def __init__(self, fault=None, **overrides):
+        fault = fault or FaultConfig()
+        self.serper = overrides.get("serper") or SerperStub(fault)
+        self.gemini = overrides.get("gemini") or GeminiStub(fault)
+        self.groq = overrides.get("groq") or GroqStub(fault)
+        self.sheets = overrides.get("sheets") or SheetsStub(fault)
+        self.slack = overrides.get("slack") or SlackStub(fault)
+        self.all = [self.serper, self.gemini, self.groq, self.sheets, self.slack]
+
+    def __enter__(self):
+        for service in self.all:
+            service.start()
+        return self
+
+    def __exit__(self, *exc):
+        for service in self.all:
+            service.stop()
+
+    def environment(self):
+        return {
+            "SERPER_API_URL": f"{self.serper.url}/search",
+            "SERPER_API_KEY": "bench",
+            "GEMINI_BASE_URL": f"{self.gemini.url}/v1beta",
+            "GEMINI_API_KEY": "bench",
+            "GROQ_BASE_URL": self.groq.url,
+            "GROQ_API_KEY": "bench",
+            "SHEETS_API_ENDPOINT": f"{self.sheets.url}/",
+            "SPREADSHEET_ID": "bench-spreadsheet",
+            "SLACK_WEBHOOK_URL": f"{self.slack.url}/webhook",
+        }
+
+    def stats(self):
+        return {service.name: service.stats() for service in self.all}
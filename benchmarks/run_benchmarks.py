@@ -0,0 +1,306 @@
+# benchmarks/run_benchmarks.py - Offline load test for the headline generator
+"""
+Drives the Flask endpoints and every crewai_modules tool against the local
+stand-ins in fake_services.py and reports throughput, p50/p95/p99 latency and
+memory for each target. Latency comes from a pass with only RSS sampling
+(``rss_growth_mb`` is the target's peak above its starting RSS); Python
+allocations (``peak_traced_mb``) are traced in a separate, shorter pass.
+
+Usage (from the repository root):
+
+    python benchmarks/run_benchmarks.py --concurrency 8 --requests 200
+    python benchmarks/run_benchmarks.py --targets search,slack --latency-ms 50 --error-rate 0.05
+    python benchmarks/run_benchmarks.py --llm-cache-mode record   # then --llm-cache-mode replay
+"""
+import argparse
+import ipaddress
+import json
+import math
+import os
+import resource
+import socket
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_services import FakeServices, FaultConfig
+
+ALL_TARGETS = ["generate", "stream", "cron", "trigger", "search", "summarize", "sheets", "slack"]
+
+# Keep third-party libraries from phoning home during the run
+OFFLINE_ENV = {
+    "CREWAI_DISABLE_TELEMETRY": "true",
+    "OTEL_SDK_DISABLED": "true",
+    "LITELLM_LOCAL_MODEL_COST_MAP": "True",
+}
+
+
+def block_external_network():
+    """Fail fast on any connection that is not to a loopback address"""
+    original_connect = socket.socket.connect
+
+    def guarded_connect(sock, address):
+        host = address[0] if isinstance(address, tuple) else address
+        try:
+            if sock.family in (socket.AF_INET, socket.AF_INET6) and not ipaddress.ip_address(host).is_loopback:
+                raise ConnectionRefusedError(f"Benchmark blocked external connection to {host}")
+        except ValueError:
+            raise ConnectionRefusedError(f"Benchmark blocked external connection to {host}")
+        return original_connect(sock, address)
+
+    socket.socket.connect = guarded_connect
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100.0 * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+# ============================================================================
+# TARGETS
+# ============================================================================
+
+def build_targets(app_module):
+    """Return {name: callable(i) -> bool}; each call is one measured operation"""
+    from crewai_modules.searcher import Searcher
+    from crewai_modules.summarizer import Summarizer
+    from crewai_modules.spreadsheet_writer import SpreadsheetWriter
+    from crewai_modules.slack_sender import SlackSender
+
+    local = threading.local()
+
+    def client():
+        # Flask test clients are not shared between threads
+        if not hasattr(local, "client"):
+            local.client = app_module.app.test_client()
+        return local.client
+
+    def generate(i):
+        response = client().post("/api/generate", json={"topic": f"Benchmark topic {i}"})
+        return response.status_code == 200 and response.get_json().get("success", False)
+
+    def stream(i):
+        response = client().post("/api/generate/stream", json={"topic": f"Benchmark topic {i}"})
+        body = response.get_data(as_text=True)
+        return response.status_code == 200 and "event: result" in body and '"success": true' in body
+
+    def cron(i):
+        response = client().get("/api/cron/daily-headline")
+        return response.status_code == 200 and response.get_json().get("success", False)
+
+    def trigger(i):
+        response = client().post("/api/automation/trigger", json={"topic": f"Batch topic {i}"})
+        return response.status_code == 200 and response.get_json().get("success", False)
+
+    searcher = Searcher()
+    summarizer = Summarizer()
+    slack = SlackSender()
+
+    def search(i):
+        return "error" not in json.loads(searcher._run(f"benchmark query {i}"))
+
+    def summarize(i):
+        return bool(summarizer._run("Benchmark text to summarize. " * 20))
+
+    def sheets(i):
+        if not hasattr(local, "writer"):
+            # googleapiclient services are not thread-safe; one per worker thread
+            local.writer = SpreadsheetWriter()
+        result = local.writer._run("Benchmark", ["headline", "date", "sources", "topic"],
+                                   {"headline": f"Headline {i}", "date": "2026-01-01",
+                                    "sources": "https://example.com", "topic": "bench"})
+        return result.startswith("Successfully")
+
+    def slack_send(i):
+        return slack._run(f"Headline {i}", "bench", "https://example.com").startswith("Successfully")
+
+    return {
+        "generate": generate,
+        "stream": stream,
+        "cron": cron,
+        "trigger": trigger,
+        "search": search,
+        "summarize": summarize,
+        "sheets": sheets,
+        "slack": slack_send,
+    }
+
+
+def current_rss_mb():
+    """Resident set size right now (Linux /proc); falls back to the process peak elsewhere"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class RSSSampler:
+    """Samples RSS in the background; ``growth_mb`` is the peak above the starting RSS"""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.start_mb = self.peak_mb = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.start_mb = self.peak_mb = current_rss_mb()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak_mb = max(self.peak_mb, current_rss_mb())
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_mb = max(self.peak_mb, current_rss_mb())
+
+    @property
+    def growth_mb(self):
+        return self.peak_mb - self.start_mb
+
+
+def run_pass(operation, total, concurrency):
+    """Run ``total`` operations; returns (sorted latencies in ms, failures, wall seconds)"""
+    latencies = []
+    failures = 0
+    lock = threading.Lock()
+
+    def timed(i):
+        nonlocal failures
+        start = time.perf_counter()
+        try:
+            ok = operation(i)
+        except Exception:
+            ok = False
+        elapsed = (time.perf_counter() - start) * 1000.0
+        with lock:
+            latencies.append(elapsed)
+            if not ok:
+                failures += 1
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(timed, range(total)))
+    wall = time.perf_counter() - wall_start
+    latencies.sort()
+    return latencies, failures, wall
+
+
+def run_target(name, operation, total, concurrency, memory_requests=None):
+    # Timed pass: only RSS sampling, which does not slow the operations down
+    with RSSSampler() as rss:
+        latencies, failures, wall = run_pass(operation, total, concurrency)
+
+    # Separate, shorter pass for Python allocations - tracemalloc hooks every
+    # allocation and would distort the latency numbers above
+    memory_requests = min(total, memory_requests or max(concurrency * 2, 10))
+    tracemalloc.start()
+    run_pass(operation, memory_requests, concurrency)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "target": name,
+        "requests": total,
+        "concurrency": concurrency,
+        "failures": failures,
+        "throughput_rps": round(total / wall, 2) if wall else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "peak_traced_mb": round(peak / (1024 * 1024), 2),
+        "rss_growth_mb": round(rss.growth_mb, 2),
+    }
+
+
+def print_table(results):
+    columns = ["target", "requests", "concurrency", "failures", "throughput_rps",
+               "p50_ms", "p95_ms", "p99_ms", "peak_traced_mb", "rss_growth_mb"]
+    widths = {c: max(len(c), *(len(str(r[c])) for r in results)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    print("  ".join("-" * widths[c] for c in columns))
+    for r in results:
+        print("  ".join(str(r[c]).ljust(widths[c]) for c in columns))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline load test for the AI Headline Generator")
+    parser.add_argument("--targets", default=",".join(ALL_TARGETS),
+                        help=f"Comma-separated subset of: {', '.join(ALL_TARGETS)}")
+    parser.add_argument("--requests", type=int, default=50, help="Operations per target")
+    parser.add_argument("--memory-requests", type=int, default=None,
+                        help="Operations in the traced memory pass (default: 2x concurrency, at least 10)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent workers per target")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Injected latency per fake response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Extra uniform random latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of fake responses that fail")
+    parser.add_argument("--error-status", type=int, default=500, help="HTTP status used for injected failures")
+    parser.add_argument("--llm-cache-mode", choices=["off", "on", "record", "replay"], default="off",
+                        help="LLM cache mode; record once, then replay for deterministic runs")
+    parser.add_argument("--llm-cache-path", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "llm_cache.db"),
+                        help="LLM cache database used by --llm-cache-mode")
+    parser.add_argument("--allow-network", action="store_true", help="Do not block non-loopback connections")
+    parser.add_argument("--json", dest="json_path", help="Also write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    targets = [t.strip() for t in args.targets.split(",") if t.strip()]
+    unknown = [t for t in targets if t not in ALL_TARGETS]
+    if unknown:
+        parser.error(f"Unknown targets: {', '.join(unknown)}")
+
+    fault = FaultConfig(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                        error_rate=args.error_rate, error_status=args.error_status)
+
+    if not args.allow_network:
+        block_external_network()
+
+    with FakeServices(fault) as services, tempfile.TemporaryDirectory(prefix="headline-bench-") as state_dir:
+        os.environ.update(OFFLINE_ENV)
+        os.environ.update(services.environment())
+        os.environ["LLM_CACHE_MODE"] = args.llm_cache_mode
+        os.environ["LLM_CACHE_PATH"] = args.llm_cache_path
+        # Fresh outbox and prefetch state, so rows queued by a dev instance never reach the fakes
+        os.environ["OUTBOX_PATH"] = os.path.join(state_dir, "outbox.db")
+        os.environ["PREFETCH_DIR"] = os.path.join(state_dir, "research_prefetch")
+
+        # app builds its generator at import time, so import after the env is set
+        import app as app_module
+
+        operations = build_targets(app_module)
+        results = []
+        for name in targets:
+            print(f"⏱️  Running {name} ({args.requests} requests, concurrency {args.concurrency})...")
+            results.append(run_target(name, operations[name], args.requests, args.concurrency,
+                                      memory_requests=args.memory_requests))
+        if app_module.outbox:
+            app_module.outbox.stop()  # Before the temporary outbox file goes away
+
+        print()
+        print_table(results)
+        print()
+        print(f"📡 Fake service traffic: {json.dumps(services.stats())}")
+
+        if args.json_path:
+            with open(args.json_path, "w") as f:
+                json.dump({"results": results, "services": services.stats(),
+                           "fault": vars(fault)}, f, indent=2)
+
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+# crewai_modules/agent_pool.py
+"""
+Pool of independently built agent/tool sets so one process can run several
+crews concurrently.
+
+Each pool member owns its own Agent, LLM and tool instances (and therefore its
+own per-run state). ``SharedClients`` builds the expensive pieces once: the
+HTTP connection pool (one ``HTTPAdapter``, backed by urllib3's thread-safe
+pool manager), the Groq client and the Google credentials. ``requests.Session``
+itself makes no thread-safety promise (cookies, auth state), so every caller
+gets its own session mounted on the shared adapter. The Sheets service is also
+built per member because googleapiclient's httplib2 transport is not
+thread-safe.
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+class PoolExhaustedError(RuntimeError):
+    """Raised when no pool member becomes available within the checkout timeout"""
+
+
+class SharedClients:
+    """Lazily built clients that every pool member may share across threads"""
+
+    def __init__(self, max_connections=10):
+        self.max_connections = max_connections
+        self._lock = threading.Lock()
+        self._adapter = None
+        self._groq = None
+        self._google_credentials = None
+
+    def http_adapter(self):
+        with self._lock:
+            if self._adapter is None:
+                self._adapter = HTTPAdapter(pool_connections=self.max_connections,
+                                            pool_maxsize=self.max_connections)
+            return self._adapter
+
+    def http_session(self):
+        """A new session for the caller, reusing the shared connection pool"""
+        adapter = self.http_adapter()
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def groq_client(self):
+        with self._lock:
+            if self._groq is None:
+                from groq import Groq
+                self._groq = Groq(api_key=os.environ.get("GROQ_API_KEY"))
+            return self._groq
+
+    def google_credentials(self):
+        with self._lock:
+            if self._google_credentials is None:
+                if os.getenv("SHEETS_API_ENDPOINT"):
+                    # Local stand-in (benchmarks / offline runs) - no Google auth needed
+                    from google.auth.credentials import AnonymousCredentials
+                    self._google_credentials = AnonymousCredentials()
+                else:
+                    import google.auth
+                    self._google_credentials, _ = google.auth.default(
+                        scopes=["https://www.googleapis.com/auth/spreadsheets"]
+                    )
+            return self._google_credentials
+
+
+class AgentPool:
+    """Checkout/return pool of members built on demand by ``factory``
+
+    Members are created lazily up to ``size``. ``health_check(member)`` runs on
+    every checkout and every return; a member that fails it (or raises while
+    checked out) is discarded, which frees capacity for a waiting caller to
+    build a fresh one.
+    """
+
+    def __init__(self, factory, size=4, health_check=None, checkout_timeout=300):
+        if size < 1:
+            raise ValueError("Agent pool size must be at least 1")
+        self.factory = factory
+        self.size = size
+        self.health_check = health_check or (lambda member: True)
+        self.checkout_timeout = checkout_timeout
+
+        self._idle = []
+        self._available = threading.Condition()
+        self._created = 0
+        self._in_use = 0
+        self._discarded = 0
+        self._checkouts = 0
+        self._wait_time_total = 0.0
+
+    def _build(self):
+        try:
+            return self.factory()
+        except Exception:
+            self._forget()
+            raise
+
+    def _forget(self):
+        # Capacity is free again - wake a waiter so it can grow the pool
+        with self._available:
+            self._created -= 1
+            self._available.notify()
+
+    def _acquire(self, timeout):
+        # Prefer an idle member, then grow the pool, then wait for either
+        deadline = time.monotonic() + timeout
+        with self._available:
+            while True:
+                if self._idle:
+                    return self._idle.pop()
+                if self._created < self.size:
+                    self._created += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolExhaustedError(
+                        f"No agent available after {timeout}s (pool size {self.size})"
+                    )
+                self._available.wait(remaining)
+        return self._build()
+
+    def warm(self, count=1):
+        """Build up to ``count`` idle members ahead of the first request"""
+        for _ in range(count):
+            with self._available:
+                if self._created >= self.size:
+                    return
+                self._created += 1
+            member = self._build()
+            with self._available:
+                self._idle.append(member)
+                self._available.notify()
+
+    def _is_healthy(self, member):
+        try:
+            return bool(self.health_check(member))
+        except Exception:
+            return False
+
+    def _discard(self):
+        with self._available:
+            self._discarded += 1
+        self._forget()
+
+    def acquire(self, timeout=None):
+        """Check a healthy member out of the pool"""
+        timeout = self.checkout_timeout if timeout is None else timeout
+        start = time.monotonic()
+
+        member = self._acquire(timeout)
+        if not self._is_healthy(member):
+            print("♻️ Agent pool: replacing unhealthy member")
+            with self._available:
+                self._discarded += 1
+            # Keep the slot and rebuild in place
+            member = self._build()
+
+        with self._available:
+            self._in_use += 1
+            self._checkouts += 1
+            self._wait_time_total += time.monotonic() - start
+        return member
+
+    def release(self, member, healthy=True):
+        """Return a member to the pool, or drop it if it is no longer usable"""
+        healthy = healthy and self._is_healthy(member)
+        with self._available:
+            self._in_use -= 1
+            if healthy:
+                self._idle.append(member)
+                self._available.notify()
+        if not healthy:
+            print("♻️ Agent pool: discarding unhealthy member")
+            self._discard()
+
+    @contextmanager
+    def checkout(self, timeout=None):
+        member = self.acquire(timeout)
+        healthy = True
+        try:
+            yield member
+        except Exception:
+            healthy = False
+            raise
+        finally:
+            self.release(member, healthy=healthy)
+
+    def stats(self):
+        with self._available:
+            return {
+                "size": self.size,
+                "created": self._created,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "discarded": self._discarded,
+                "checkouts": self._checkouts,
+                "avg_wait_ms": round(self._wait_time_total / self._checkouts * 1000, 2) if self._checkouts else 0.0
+            }
@@ -0,0 +1,231 @@
+# crewai_modules/llm_cache.py
+"""
+On-disk cache at the LLM call boundary.
+
+Responses are keyed on the model, the sampling parameters and the
+canonicalized message list, and stored in SQLite with TTL and size-based LRU
+eviction. Modes (LLM_CACHE_MODE):
+
+- ``off``    - every call goes to the provider
+- ``on``     - serve fresh hits, call and store on a miss (default)
+- ``record`` - always call the provider and overwrite the stored response
+- ``replay`` - serve only recorded responses (TTL ignored); a miss raises
+               ``CacheMissError``, so runs are deterministic and network-free
+
+Responses stored in record mode are fixtures: TTL and size eviction never
+remove them. Empty responses are never stored.
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from crewai import LLM
+from dotenv import load_dotenv
+
+load_dotenv()
+
+MODES = ("off", "on", "record", "replay")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used_at REAL NOT NULL,
+    recorded INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS llm_cache_last_used ON llm_cache (last_used_at);
+"""
+
+
+class CacheMissError(RuntimeError):
+    """Raised in replay mode when no recorded response exists"""
+
+
+def _canonical_tool_call(call, call_ids):
+    if hasattr(call, "model_dump"):
+        call = call.model_dump()
+    function = call.get("function") or {}
+    arguments = function.get("arguments", "")
+    if isinstance(arguments, str):
+        try:
+            arguments = json.loads(arguments) if arguments.strip() else {}
+        except ValueError:
+            pass  # Keep malformed arguments verbatim
+    return {
+        "id": call_ids.setdefault(call.get("id"), f"call_{len(call_ids)}"),
+        "type": call.get("type", "function"),
+        "name": function.get("name", ""),
+        "arguments": arguments
+    }
+
+
+def canonicalize_messages(messages):
+    """Normalize a prompt into a stable list of {role, content} dicts
+
+    Tool calls keep their name and (parsed) arguments; provider-generated call
+    ids are replaced by their order of appearance so they do not change the key.
+    """
+    if isinstance(messages, str):
+        messages = [{"role": "user", "content": messages}]
+    canonical = []
+    call_ids = {}
+    for message in messages:
+        content = message.get("content", "")
+        if isinstance(content, str):
+            # Indentation and line wrapping in task descriptions is not meaningful
+            content = re.sub(r"\s+", " ", content).strip()
+        entry = {"role": message.get("role", "user"), "content": content}
+        if message.get("name"):
+            entry["name"] = message["name"]
+        if message.get("tool_calls"):
+            entry["tool_calls"] = [_canonical_tool_call(call, call_ids) for call in message["tool_calls"]]
+        if message.get("tool_call_id"):
+            entry["tool_call_id"] = call_ids.setdefault(message["tool_call_id"], f"call_{len(call_ids)}")
+        canonical.append(entry)
+    return canonical
+
+
+def make_key(model, params, messages):
+    payload = {
+        "model": model,
+        "params": {k: v for k, v in sorted(params.items()) if v is not None},
+        "messages": canonicalize_messages(messages)
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    def __init__(self, path=None, mode=None, ttl_hours=None, max_mb=None):
+        self.path = path or os.getenv("LLM_CACHE_PATH", "/tmp/llm_cache.db")
+        self.mode = (mode or os.getenv("LLM_CACHE_MODE", "on")).lower()
+        if self.mode not in MODES:
+            raise ValueError(f"LLM_CACHE_MODE must be one of {', '.join(MODES)}")
+        self.ttl_seconds = float(ttl_hours or os.getenv("LLM_CACHE_TTL_HOURS", "12")) * 3600
+        self.max_bytes = int(float(max_mb or os.getenv("LLM_CACHE_MAX_MB", "100")) * 1024 * 1024)
+
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if self.mode != "off":
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = self._conn()
+            conn.executescript(SCHEMA)
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(llm_cache)")]
+            if "recorded" not in columns:
+                # Cache files created before fixtures were tracked
+                conn.execute("ALTER TABLE llm_cache ADD COLUMN recorded INTEGER NOT NULL DEFAULT 0")
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._conn().execute(
+            "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        response, created_at = row
+        if self.mode != "replay" and time.time() - created_at > self.ttl_seconds:
+            return None
+        self._conn().execute("UPDATE llm_cache SET last_used_at = ? WHERE key = ?", (time.time(), key))
+        return response
+
+    def put(self, key, model, response):
+        now = time.time()
+        self._conn().execute(
+            "INSERT OR REPLACE INTO llm_cache (key, model, response, size, created_at, last_used_at, recorded) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, model, response, len(response.encode("utf-8")), now, now, int(self.mode == "record"))
+        )
+        self._evict()
+
+    def _evict(self):
+        # Recorded fixtures are exempt from both TTL and size eviction
+        conn = self._conn()
+        conn.execute("DELETE FROM llm_cache WHERE recorded = 0 AND created_at < ?", (time.time() - self.ttl_seconds,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache WHERE recorded = 0").fetchone()[0]
+        while total > self.max_bytes:
+            row = conn.execute(
+                "SELECT key, size FROM llm_cache WHERE recorded = 0 ORDER BY last_used_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            conn.execute("DELETE FROM llm_cache WHERE key = ?", (row[0],))
+            total -= row[1]
+
+    def cached_call(self, model, params, messages, call):
+        """Return ``call()``'s text response, going through the cache according to the mode"""
+        if self.mode == "off":
+            return call()
+
+        key = make_key(model, params, messages)
+        if self.mode in ("on", "replay"):
+            cached = self.get(key)
+            if cached is not None:
+                with self._stats_lock:
+                    self.hits += 1
+                return cached
+            with self._stats_lock:
+                self.misses += 1
+            if self.mode == "replay":
+                raise CacheMissError(f"No recorded {model} response for this prompt (key {key[:12]})")
+
+        response = call()
+        if isinstance(response, str) and response.strip():
+            self.put(key, model, response)
+        return response
+
+    def stats(self):
+        stats = {"mode": self.mode, "hits": self.hits, "misses": self.misses}
+        if self.mode != "off":
+            entries, size = self._conn().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()
+            stats.update({"entries": entries, "size_mb": round(size / (1024 * 1024), 2), "path": self.path})
+        return stats
+
+
+class CachedLLM(LLM):
+    """crewai LLM whose text completions go through an LLMCache"""
+
+    def __init__(self, *args, cache=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._response_cache = cache
+
+    def _cache_params(self, tools=None):
+        params = {
+            name: getattr(self, name, None)
+            for name in ("temperature", "top_p", "max_tokens", "stop", "response_format")
+        }
+        if tools:
+            params["tools"] = [tool.get("function", {}).get("name", str(tool)) if isinstance(tool, dict) else str(tool)
+                               for tool in tools]
+        return params
+
+    def call(self, messages, *args, **kwargs):
+        if self._response_cache is None:
+            return super().call(messages, *args, **kwargs)
+        tools = kwargs.get("tools") or (args[0] if args else None)
+        return self._response_cache.cached_call(
+            self.model,
+            self._cache_params(tools),
+            messages,
+            lambda: super(CachedLLM, self).call(messages, *args, **kwargs)
+        )
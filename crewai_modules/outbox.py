@@ -0,0 +1,314 @@
+# crewai_modules/outbox.py
+"""
+Durable write-behind outbox for Sheets and Slack deliveries.
+
+Tools commit a delivery to a local SQLite database (WAL mode) and return
+immediately; one background drainer per channel delivers the rows in the
+order they were enqueued, retrying with exponential backoff. Rows survive a
+restart and are replayed in order by the next drainer.
+
+Delivery is at-least-once. Each row carries an idempotency key: enqueueing the
+same key twice is a no-op, and a row is never re-sent once it is marked
+delivered. The Sheets writer also stores the key in an ``outbox_key``
+column, so a retry after an append whose response was lost does not add the
+row twice. Only one drainer (per channel, across processes sharing the file)
+holds the drain lease at a time, which keeps ordering intact.
+
+Rows are only as durable as the file they live in: ``OUTBOX_PATH`` must point
+at persistent storage that outlives the process (a mounted volume on a
+long-running host). The ``/tmp`` default suits local development only - on a
+serverless host the instance is frozen or recycled after the response, so
+queued rows may never be drained. app.py therefore leaves the outbox off when
+``VERCEL`` is set unless ``OUTBOX_ENABLED`` says otherwise.
+"""
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    channel TEXT NOT NULL,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    last_error TEXT,
+    last_attempt_at REAL,
+    created_at REAL NOT NULL,
+    delivered_at REAL
+);
+CREATE INDEX IF NOT EXISTS outbox_channel_status ON outbox (channel, status, id);
+CREATE TABLE IF NOT EXISTS drain_leases (
+    channel TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+class Outbox:
+    def __init__(self, path=None, max_attempts=None, base_backoff=2.0, max_backoff=300.0,
+                 poll_interval=5.0, lease_seconds=60.0, retention_hours=None):
+        self.path = path or os.getenv("OUTBOX_PATH", "/tmp/headline_outbox.db")
+        self.max_attempts = int(max_attempts or os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.retention_seconds = float(retention_hours or os.getenv("OUTBOX_RETENTION_HOURS", "24")) * 3600
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+        self._local = threading.local()
+        self._handlers = {}
+        self._wake = {}
+        self._drain_locks = {}
+        self._threads = []
+        self._stop = threading.Event()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+        columns = [row["name"] for row in conn.execute("PRAGMA table_info(outbox)")]
+        if "last_attempt_at" not in columns:
+            # Outbox files created before attempts were timestamped
+            conn.execute("ALTER TABLE outbox ADD COLUMN last_attempt_at REAL")
+
+    def _conn(self):
+        """One connection per thread; autocommit with WAL keeps enqueues sub-millisecond"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def enqueue(self, channel, payload, idempotency_key=None):
+        """Durably record a delivery and return its outbox id"""
+        key = idempotency_key or uuid.uuid4().hex
+        conn = self._conn()
+        cursor = conn.execute(
+            "INSERT OR IGNORE INTO outbox (channel, idempotency_key, payload, created_at) VALUES (?, ?, ?, ?)",
+            (channel, key, json.dumps(payload, ensure_ascii=False), time.time())
+        )
+        if cursor.rowcount:
+            outbox_id = cursor.lastrowid
+        else:
+            # Duplicate key - the delivery is already queued (or done)
+            outbox_id = conn.execute(
+                "SELECT id FROM outbox WHERE idempotency_key = ?", (key,)
+            ).fetchone()["id"]
+
+        if channel in self._wake:
+            self._wake[channel].set()
+        return outbox_id
+
+    # ------------------------------------------------------------------
+    # Drainer side
+    # ------------------------------------------------------------------
+
+    def register(self, channel, deliver):
+        """Register ``deliver(payload)``, which must raise if delivery fails"""
+        self._handlers[channel] = deliver
+        self._wake[channel] = threading.Event()
+        self._drain_locks[channel] = threading.Lock()
+
+    def start(self):
+        """Start one background drainer thread per registered channel"""
+        self._stop.clear()
+        for channel in self._handlers:
+            thread = threading.Thread(target=self._drain_loop, args=(channel,),
+                                      name=f"outbox-{channel}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        for event in self._wake.values():
+            event.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        # Hand the channels over to the next process straight away
+        self._conn().execute("DELETE FROM drain_leases WHERE owner = ?", (self.owner,))
+
+    def _drain_loop(self, channel):
+        last_prune = 0.0
+        while not self._stop.is_set():
+            try:
+                delivered = self.drain_once(channel)
+                if time.time() - last_prune > 3600:
+                    self._prune()
+                    last_prune = time.time()
+            except Exception as e:
+                print(f"⚠️ Outbox drainer '{channel}' error: {str(e)}")
+                delivered = 0
+            if not delivered:
+                self._wake[channel].wait(self.poll_interval)
+                self._wake[channel].clear()
+
+    def _acquire_lease(self, channel):
+        now = time.time()
+        conn = self._conn()
+        conn.execute(
+            """INSERT INTO drain_leases (channel, owner, expires_at) VALUES (?, ?, ?)
+               ON CONFLICT(channel) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at
+               WHERE drain_leases.owner = excluded.owner OR drain_leases.expires_at < ?""",
+            (channel, self.owner, now + self.lease_seconds, now)
+        )
+        row = conn.execute("SELECT owner FROM drain_leases WHERE channel = ?", (channel,)).fetchone()
+        return row is not None and row["owner"] == self.owner
+
+    def _backoff(self, attempts):
+        return min(self.base_backoff * (2 ** (attempts - 1)), self.max_backoff)
+
+    def drain_once(self, channel, max_items=100, force=False):
+        """Deliver pending rows for a channel in order; returns how many were delivered
+
+        Stops at the first row that fails (or is still backing off, unless
+        ``force``) so later rows never overtake it. Rows that exhaust
+        ``max_attempts`` are marked dead and skipped.
+        """
+        deliver = self._handlers[channel]
+        delivered = 0
+        with self._drain_locks[channel]:
+            conn = self._conn()
+            while delivered < max_items and self._acquire_lease(channel):
+                row = conn.execute(
+                    """SELECT id, payload, attempts, next_attempt_at FROM outbox
+                       WHERE channel = ? AND status = 'pending' ORDER BY id LIMIT 1""",
+                    (channel,)
+                ).fetchone()
+                if row is None:
+                    break
+                if not force and row["next_attempt_at"] > time.time():
+                    break
+
+                attempts = row["attempts"] + 1
+                try:
+                    deliver(json.loads(row["payload"]))
+                except Exception as e:
+                    now = time.time()
+                    if attempts >= self.max_attempts:
+                        print(f"☠️ Outbox {channel} #{row['id']} gave up after {attempts} attempts: {str(e)}")
+                        conn.execute(
+                            "UPDATE outbox SET status = 'dead', attempts = ?, last_error = ?, last_attempt_at = ? WHERE id = ?",
+                            (attempts, str(e), now, row["id"])
+                        )
+                        continue
+                    conn.execute(
+                        """UPDATE outbox SET attempts = ?, next_attempt_at = ?, last_error = ?, last_attempt_at = ?
+                           WHERE id = ?""",
+                        (attempts, now + self._backoff(attempts), str(e), now, row["id"])
+                    )
+                    break
+
+                now = time.time()
+                conn.execute(
+                    """UPDATE outbox SET status = 'delivered', attempts = ?, delivered_at = ?, last_attempt_at = ?,
+                       last_error = NULL WHERE id = ?""",
+                    (attempts, now, now, row["id"])
+                )
+                delivered += 1
+        return delivered
+
+    def flush(self, timeout=30.0, channels=None):
+        """Deliver everything pending now; returns the metrics afterwards
+
+        The first pass ignores backoff; later passes respect it, so a service
+        that is down does not burn through every retry within one flush.
+        """
+        channels = [c for c in (channels or self._handlers) if c in self._handlers]
+        deadline = time.monotonic() + timeout
+        remaining = set(channels)
+        force = True
+        while remaining and time.monotonic() < deadline:
+            for channel in list(remaining):
+                self.drain_once(channel, force=force)
+                if not self._pending_count(channel):
+                    remaining.discard(channel)
+            force = False
+            if remaining:
+                time.sleep(0.2)
+        return self.metrics()
+
+    def retry_dead(self, channel=None):
+        """Move dead rows back to pending; returns how many were requeued"""
+        query = "UPDATE outbox SET status = 'pending', attempts = 0, next_attempt_at = 0 WHERE status = 'dead'"
+        params = ()
+        if channel:
+            query += " AND channel = ?"
+            params = (channel,)
+        count = self._conn().execute(query, params).rowcount
+        for event in self._wake.values():
+            event.set()
+        return count
+
+    def _prune(self):
+        self._conn().execute(
+            "DELETE FROM outbox WHERE status = 'delivered' AND delivered_at < ?",
+            (time.time() - self.retention_seconds,)
+        )
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def _pending_count(self, channel):
+        return self._conn().execute(
+            "SELECT COUNT(*) AS n FROM outbox WHERE channel = ? AND status = 'pending'", (channel,)
+        ).fetchone()["n"]
+
+    def metrics(self):
+        now = time.time()
+        conn = self._conn()
+        channels = {}
+        for channel in sorted(set(self._handlers) | {r["channel"] for r in conn.execute("SELECT DISTINCT channel FROM outbox")}):
+            channels[channel] = {"pending": 0, "retrying": 0, "delivered": 0, "dead": 0,
+                                 "oldest_pending_age_s": 0.0, "last_error": None}
+
+        for row in conn.execute(
+            "SELECT channel, status, COUNT(*) AS n, MIN(created_at) AS oldest FROM outbox GROUP BY channel, status"
+        ):
+            stats = channels[row["channel"]]
+            stats[row["status"]] = row["n"]
+            if row["status"] == "pending":
+                stats["oldest_pending_age_s"] = round(now - row["oldest"], 2)
+
+        for row in conn.execute(
+            "SELECT channel, COUNT(*) AS n FROM outbox WHERE status = 'pending' AND attempts > 0 GROUP BY channel"
+        ):
+            channels[row["channel"]]["retrying"] = row["n"]
+
+        # Most recent failure per channel (retrying or dead)
+        for channel, stats in channels.items():
+            row = conn.execute(
+                """SELECT last_error FROM outbox WHERE channel = ? AND last_error IS NOT NULL
+                   ORDER BY last_attempt_at DESC, id DESC LIMIT 1""",
+                (channel,)
+            ).fetchone()
+            if row:
+                stats["last_error"] = row["last_error"]
+
+        return {
+            "path": self.path,
+            "backlog": sum(c["pending"] for c in channels.values()),
+            "channels": channels
+        }
@@ -0,0 +1,105 @@
+# crewai_modules/research_prefetch.py
+"""
+Ahead-of-time research for scheduled headline runs.
+
+The prefetch cron warms search results and a summary for every topic of the
+upcoming slot and stores them as JSON files (one per slot date and topic).
+The scheduled run then hands the cached research to the crew, so it only has
+to compose the headline and deliver it.
+
+The prefetch and the scheduled run are separate invocations, which on a
+serverless host usually land on different instances. ``PREFETCH_DIR`` must
+therefore point at storage both can see (a mounted shared volume, or a
+persistent disk on a long-running host); the ``/tmp`` default only works when
+a single process serves both crons, so /api/cron/prefetch refuses to run on
+Vercel unless ``PREFETCH_DIR`` is set. A miss is not fatal - the run falls
+back to live research - but it loses the head start.
+"""
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+class ResearchPrefetcher:
+    def __init__(self, searcher, summarizer, cache_dir=None, ttl_hours=None):
+        self.searcher = searcher
+        self.summarizer = summarizer
+        self.cache_dir = cache_dir or os.getenv("PREFETCH_DIR", "/tmp/research_prefetch")
+        self.ttl_seconds = float(ttl_hours or os.getenv("PREFETCH_TTL_HOURS", "24")) * 3600
+
+    def _path(self, topic, slot):
+        slug = re.sub(r"[^a-z0-9]+", "-", topic.lower()).strip("-") or "topic"
+        return os.path.join(self.cache_dir, slot.isoformat(), f"{slug}.json")
+
+    def prefetch(self, topic, slot):
+        """Search and summarize one topic, then store it for the given slot date"""
+        search_json = self.searcher._run(topic)
+        search_data = json.loads(search_json)
+        if search_data.get("error"):
+            raise RuntimeError(search_data["error"])
+        sources = search_data.get("results", [])
+
+        snippets = "\n".join(
+            f"- {s.get('title')}: {s.get('snippet')} ({s.get('link')})" for s in sources
+        )
+        summary = self.summarizer._run(snippets) if snippets else ""
+
+        record = {
+            "topic": topic,
+            "slot": slot.isoformat(),
+            "fetched_at": time.time(),
+            "sources": sources,
+            "summary": summary
+        }
+
+        path = self._path(topic, slot)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(record, f, ensure_ascii=False)
+        os.replace(tmp_path, path)  # Atomic, so the 9:00 run never reads half a file
+        return record
+
+    def prefetch_many(self, topics, slot, max_workers=4):
+        """Prefetch several topics in parallel; never raises for a single topic"""
+        def run(topic):
+            try:
+                record = self.prefetch(topic, slot)
+                return {"topic": topic, "success": True, "sources": len(record["sources"])}
+            except Exception as e:
+                print(f"⚠️ Prefetch failed for '{topic}': {str(e)}")
+                return {"topic": topic, "success": False, "error": str(e)}
+
+        if not topics:
+            return []
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(topics)))) as pool:
+            return list(pool.map(run, topics))
+
+    def get(self, topic, slot):
+        """Return the cached research for a topic/slot, or None if missing or stale"""
+        path = self._path(topic, slot)
+        try:
+            with open(path, "r") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - record.get("fetched_at", 0) > self.ttl_seconds:
+            return None
+        return record
+
+    @staticmethod
+    def format_notes(record):
+        """Render a cached record as research notes for a task description"""
+        lines = [f"Summary: {record.get('summary') or 'n/a'}", "Sources:"]
+        for source in record.get("sources", []):
+            lines.append(f"- {source.get('title')} - {source.get('link')}: {source.get('snippet')}")
+        fetched = datetime.fromtimestamp(record.get("fetched_at", 0)).strftime("%Y-%m-%d %H:%M")
+        lines.append(f"(Research gathered at {fetched})")
+        return "\n".join(lines)
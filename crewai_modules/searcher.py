@@ -16,9 +16,10 @@ class Searcher(BaseTool):
     name: str = "Search Tool"
     description: str = "Search the internet using the Serper API and return structured results."
     args_schema: type[BaseModel] = SearchInput
+    session: object = None  # Optional shared requests.Session
 
     def _run(self, query: str) -> str:
-        url = "https://google.serper.dev/search"
+        url = os.environ.get("SERPER_API_URL", "https://google.serper.dev/search")
 
         payload = {
             "q": query,
@@ -29,7 +30,8 @@ class Searcher(BaseTool):
             "Content-Type": "application/json"
         }
 
-        response = requests.post(url, headers=headers, data=json.dumps(payload))
+        http = self.session or requests
+        response = http.post(url, headers=headers, data=json.dumps(payload))
 
         if response.status_code != 200:
             return json.dumps({
@@ -0,0 +1,259 @@
+# crewai_modules/sheet_exporter.py
+"""
+Streaming bulk export of the headline history stored in Google Sheets.
+
+Rows are read in fixed-size ranges (several ranges per ``batchGet`` call),
+filtered by date/topic, and converted to CSV, NDJSON or Parquet page by page,
+so memory stays constant regardless of the sheet size. Every exported record
+carries its sheet row number (``_row``) so a nightly job can resume with
+``start_row = last _row + 1``.
+"""
+import csv
+import io
+import json
+import os
+import re
+from datetime import datetime
+
+from dotenv import load_dotenv
+
+from crewai_modules.spreadsheet_writer import build_sheets_service
+
+load_dotenv()
+
+FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+MAX_PAGE_SIZE = 5000  # Rows per range; keeps a single page's memory bounded
+
+DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+def check_date(value, name="date"):
+    """Return ``value`` if it is a YYYY-MM-DD date, otherwise raise ValueError"""
+    try:
+        if not DATE_RE.match(value):
+            raise ValueError
+        datetime.strptime(value, "%Y-%m-%d")
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be a date in YYYY-MM-DD format, got '{value}'")
+    return value
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands back whatever was written since the last drain"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class SheetExporter:
+    def __init__(self, service=None, credentials=None, spreadsheet_id=None, page_size=None, pages_per_request=4):
+        self.spreadsheet_id = spreadsheet_id or os.getenv("SPREADSHEET_ID")
+        if not self.spreadsheet_id:
+            raise ValueError("SPREADSHEET_ID not found in .env file")
+        self.service = service or build_sheets_service(credentials)
+        if page_size is None or page_size == "":
+            page_size = os.getenv("EXPORT_PAGE_SIZE", "500")
+        try:
+            self.page_size = int(page_size)
+        except (TypeError, ValueError):
+            raise ValueError(f"page_size must be an integer, got '{page_size}'")
+        if not 1 <= self.page_size <= MAX_PAGE_SIZE:
+            raise ValueError(f"page_size must be between 1 and {MAX_PAGE_SIZE}, got {self.page_size}")
+        self.pages_per_request = pages_per_request
+        self.last_row = 0  # Last non-empty sheet row read (filtered or not)
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _quote(sheet_name):
+        # A1 notation needs quotes around names with spaces or punctuation
+        return "'" + sheet_name.replace("'", "''") + "'"
+
+    def row_count(self, sheet_name):
+        """Rows in the sheet's grid, trailing empty ones included; HttpError if the sheet does not exist"""
+        result = self.service.spreadsheets().get(
+            spreadsheetId=self.spreadsheet_id,
+            ranges=[self._quote(sheet_name)],
+            fields="sheets(properties(title,gridProperties(rowCount)))"
+        ).execute()
+        for sheet in result.get("sheets", []):
+            return int(sheet.get("properties", {}).get("gridProperties", {}).get("rowCount", 0))
+        raise ValueError(f"Sheet '{sheet_name}' not found")
+
+    def read_headings(self, sheet_name):
+        result = self.service.spreadsheets().values().get(
+            spreadsheetId=self.spreadsheet_id,
+            range=f"{self._quote(sheet_name)}!1:1"
+        ).execute()
+        values = result.get("values", [])
+        return [str(h).strip() for h in values[0]] if values else []
+
+    def iter_pages(self, sheet_name, headings, start_row=2, row_count=None):
+        """Yield lists of (row_number, record) one page at a time
+
+        Sheets leaves trailing empty rows out of a range, so a short page does
+        not mean the end of the sheet. Reading stops at ``row_count`` (the
+        grid size) or, when that is unknown, at the first batch of all-empty
+        ranges.
+        """
+        start_row = max(int(start_row), 2)  # Row 1 holds the headings
+        while row_count is None or start_row <= row_count:
+            ranges = []
+            for i in range(self.pages_per_request):
+                first = start_row + i * self.page_size
+                if row_count is not None and first > row_count:
+                    break
+                ranges.append(f"{self._quote(sheet_name)}!{first}:{first + self.page_size - 1}")
+
+            result = self.service.spreadsheets().values().batchGet(
+                spreadsheetId=self.spreadsheet_id,
+                ranges=ranges
+            ).execute()
+
+            value_ranges = result.get("valueRanges", [])
+            for i, value_range in enumerate(value_ranges):
+                rows = value_range.get("values", [])
+                first = start_row + i * self.page_size
+                page = []
+                for offset, row in enumerate(rows):
+                    if not any(str(cell).strip() for cell in row):
+                        continue
+                    self.last_row = first + offset
+                    padded = list(row) + [""] * (len(headings) - len(row))
+                    page.append((first + offset, dict(zip(headings, padded))))
+                if page:
+                    yield page
+
+            if row_count is None and not any(r.get("values") for r in value_ranges):
+                return  # A whole batch of empty ranges - past the last row
+            start_row += self.pages_per_request * self.page_size
+
+    @staticmethod
+    def _matches(record, date_from=None, date_to=None, topic=None):
+        lowered = {k.lower(): v for k, v in record.items()}
+        if date_from or date_to:
+            # Compare the ISO date prefix, e.g. "2026-10-19 09:00:00" -> "2026-10-19"
+            date = str(lowered.get("date", "") or lowered.get("timestamp", ""))[:10]
+            if not date or (date_from and date < date_from) or (date_to and date > date_to):
+                return False
+        if topic and topic.lower() not in str(lowered.get("topic", "")).lower():
+            return False
+        return True
+
+    def iter_records(self, sheet_name, start_row=2, date_from=None, date_to=None, topic=None,
+                     headings=None, row_count=None):
+        """Yield filtered pages of records, each including its ``_row`` number"""
+        if headings is None:
+            headings = self.read_headings(sheet_name)
+        if not headings:
+            return
+        for page in self.iter_pages(sheet_name, headings, start_row, row_count):
+            records = [
+                {"_row": row_number, **record}
+                for row_number, record in page
+                if self._matches(record, date_from, date_to, topic)
+            ]
+            if records:
+                yield headings, records
+
+    # ------------------------------------------------------------------
+    # Encoding
+    # ------------------------------------------------------------------
+
+    def export(self, fmt, sheet_name, start_row=2, date_from=None, date_to=None, topic=None):
+        """Return an iterator of bytes chunks, one chunk per page
+
+        Arguments are validated and the sheet's size and headings are read
+        before this returns, so a bad request, a missing sheet or an auth
+        failure raises here (ValueError / HttpError) rather than mid-stream.
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported export format '{fmt}' (use {', '.join(FORMATS)})")
+        if date_from:
+            check_date(date_from, "date_from")
+        if date_to:
+            check_date(date_to, "date_to")
+        row_count = self.row_count(sheet_name)
+        headings = self.read_headings(sheet_name)
+        pages = self.iter_records(sheet_name, start_row, date_from, date_to, topic,
+                                  headings=headings, row_count=row_count)
+        encoder = {"csv": self._csv, "ndjson": self._ndjson, "parquet": self._parquet}[fmt]
+        return encoder(pages)
+
+    def _csv(self, pages):
+        header_written = False
+        for headings, records in pages:
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=["_row"] + headings, extrasaction="ignore")
+            if not header_written:
+                writer.writeheader()
+                header_written = True
+            writer.writerows(records)
+            yield buffer.getvalue().encode("utf-8")
+
+    def _ndjson(self, pages):
+        for _, records in pages:
+            yield "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records).encode("utf-8")
+
+    def _parquet(self, pages):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        sink = _ChunkSink()
+        writer = None
+        schema = None
+        try:
+            for headings, records in pages:
+                if writer is None:
+                    fields = [pa.field("_row", pa.int64())] + [pa.field(h, pa.string()) for h in headings]
+                    schema = pa.schema(fields)
+                    writer = pq.ParquetWriter(sink, schema)
+                columns = {
+                    "_row": [r["_row"] for r in records],
+                    **{h: [str(r.get(h, "")) for r in records] for h in headings}
+                }
+                # One row group per page keeps memory bounded
+                writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+                yield sink.drain()
+            if writer is None:
+                # Nothing matched - still produce a valid (empty) Parquet file
+                writer = pq.ParquetWriter(sink, pa.schema([pa.field("_row", pa.int64())]))
+        finally:
+            if writer is not None:
+                writer.close()
+        yield sink.drain()
+
+
+def parquet_available():
+    try:
+        import pyarrow.parquet  # noqa: F401
+        return True
+    except ImportError:
+        return False
@@ -1,5 +1,6 @@
 # crewai_modules/slack_sender.py
 import os
+import uuid
 import requests
 from datetime import datetime
 from crewai.tools import BaseTool
@@ -8,6 +9,9 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+class SlackDeliveryError(Exception):
+    """Raised when the Slack webhook rejects a message"""
+
 class SlackInput(BaseModel):
     headline: str = Field(..., description="The generated headline")
     topic: str = Field(..., description="The topic used for generation")
@@ -19,11 +23,15 @@ class SlackSender(BaseTool):
     args_schema: type[BaseModel] = SlackInput
     webhook_url: str = ""
     spreadsheet_id: str = ""
+    session: object = None  # Optional shared requests.Session
+    outbox: object = None   # Optional Outbox - messages are queued instead of sent inline
+    run_id: str = ""        # Set per crew run; one queued message per run
 
-    def __init__(self):
+    def __init__(self, session=None, outbox=None):
         webhook_url = os.getenv("SLACK_WEBHOOK_URL", "")
         spreadsheet_id = "1Ol0Fi9OE-DX78E_187x3BGggQm2LeRTbawmJm3tgF5o"
-        super().__init__(webhook_url=webhook_url, spreadsheet_id=spreadsheet_id)
+        super().__init__(webhook_url=webhook_url, spreadsheet_id=spreadsheet_id,
+                         session=session, outbox=outbox)
 
     def _format_sources_as_links(self, sources: str) -> str:
         """Convert sources text into Slack markdown links"""
@@ -69,9 +77,9 @@ class SlackSender(BaseTool):
         
         return '\n'.join(formatted_links) if formatted_links else "See spreadsheet for details"
 
-    def _create_slack_message(self, headline: str, topic: str, sources: str = "") -> dict:
+    def _create_slack_message(self, headline: str, topic: str, sources: str = "", timestamp: str = None) -> dict:
         """Create a formatted Slack message"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
         blocks = [
             {
@@ -109,23 +117,46 @@ class SlackSender(BaseTool):
         
         return {"blocks": blocks}
 
+    def _send(self, headline: str, topic: str, sources: str = "", timestamp: str = None) -> None:
+        """Post the message to the webhook; raises on any failure"""
+        message = self._create_slack_message(headline, topic, sources, timestamp)
+        
+        http = self.session or requests
+        response = http.post(self.webhook_url, json=message, timeout=10)
+        
+        if response.status_code != 200:
+            raise SlackDeliveryError(f"Status: {response.status_code}, Response: {response.text}")
+
+    def deliver_payload(self, payload: dict) -> None:
+        """Outbox drainer entry point"""
+        self._send(**payload)
+
+    def enqueue(self, headline: str, topic: str, sources: str = "") -> int:
+        """Queue the message in the outbox (write-behind); returns the outbox id"""
+        payload = {
+            "headline": headline,
+            "topic": topic,
+            "sources": sources,
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+        run_id = self.run_id or uuid.uuid4().hex
+        return self.outbox.enqueue("slack", payload, idempotency_key=f"slack:{run_id}")
+
     def _run(self, headline: str, topic: str, sources: str = "") -> str:
         """Send message to Slack"""
         if not self.webhook_url:
             return "Error: SLACK_WEBHOOK_URL not found in environment variables"
         
+        if self.outbox is not None:
+            # Write-behind: the outbox drainer delivers it in the background
+            outbox_id = self.enqueue(headline, topic, sources)
+            return f"Queued for Slack delivery (outbox #{outbox_id}); not yet confirmed as sent."
+        
         try:
-            # Format the message
-            message = self._create_slack_message(headline, topic, sources)
-            
-            # Send to Slack
-            response = requests.post(self.webhook_url, json=message, timeout=10)
-            
-            if response.status_code == 200:
-                return "Successfully sent to Slack channel!"
-            else:
-                return f"Failed to send to Slack. Status: {response.status_code}, Response: {response.text}"
-                
+            self._send(headline, topic, sources)
+            return "Successfully sent to Slack channel!"
+        except SlackDeliveryError as e:
+            return f"Failed to send to Slack. {str(e)}"
         except requests.exceptions.Timeout:
             return "Error: Slack request timed out"
         except Exception as e:
@@ -1,14 +1,43 @@
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 import google.auth
+from google.auth.credentials import AnonymousCredentials
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 import os
+import json
+import uuid
+import hashlib
 from dotenv import load_dotenv
 
 
 load_dotenv()
 
+KEY_COLUMN = "outbox_key"  # Outbox idempotency key of the delivery that appended the row
+
+
+def _column_letter(index):
+    """0 -> A, 25 -> Z, 26 -> AA"""
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters
+
+
+def build_sheets_service(credentials=None):
+    """Build a Sheets v4 service; not thread-safe, so build one per thread/instance"""
+    api_endpoint = os.getenv("SHEETS_API_ENDPOINT")
+    if api_endpoint:
+        # Local stand-in (benchmarks / offline runs) - no Google auth needed
+        return build('sheets', 'v4', credentials=credentials or AnonymousCredentials(),
+                     client_options={"api_endpoint": api_endpoint})
+    creds = credentials
+    if creds is None:
+        creds, _ = google.auth.default(scopes=["https://www.googleapis.com/auth/spreadsheets"])
+    return build('sheets', 'v4', credentials=creds)
+
 
 class SpreadsheetInput(BaseModel):
     sheet_name: str = Field(..., description="The name of the sheet to write to.")
@@ -22,56 +51,104 @@ class SpreadsheetWriter(BaseTool):
     args_schema: type[BaseModel] = SpreadsheetInput
     spreadsheet_id: str = ""
     service: object = None
+    outbox: object = None  # Optional Outbox - rows are queued instead of written inline
+    run_id: str = ""       # Set per crew run; scopes the outbox idempotency keys
 
-    def __init__(self):
+    def __init__(self, credentials=None, outbox=None):
         spreadsheet_id = os.getenv("SPREADSHEET_ID")
         if not spreadsheet_id:
             raise ValueError("SPREADSHEET_ID not found in .env file")
         
-        service = self._get_sheets_service()
-        super().__init__(spreadsheet_id=spreadsheet_id, service=service)
+        # The service (httplib2 transport) is per instance; credentials may be shared
+        service = self._get_sheets_service(credentials)
+        super().__init__(spreadsheet_id=spreadsheet_id, service=service, outbox=outbox)
 
-    def _get_sheets_service(self):
-        creds, _ = google.auth.default(scopes=["https://www.googleapis.com/auth/spreadsheets"])
-        return build('sheets', 'v4', credentials=creds)
+    def _get_sheets_service(self, credentials=None):
+        return build_sheets_service(credentials)
 
-    def _run(self, sheet_name: str, headings: list, data: dict) -> str:
-        try:
-            sheet = self.service.spreadsheets()
-            
-            # Get existing data to find the next available row
-            result = sheet.values().get(
-                spreadsheetId=self.spreadsheet_id,
-                range=sheet_name
-            ).execute()
-            
-            existing_values = result.get('values', [])
-            
-            # If no data exists, write headings first
-            if not existing_values:
-                headings_body = {'values': [headings]}
-                sheet.values().append(
-                    spreadsheetId=self.spreadsheet_id,
-                    range=sheet_name,
-                    valueInputOption="RAW",
-                    body=headings_body
-                ).execute()
-                next_row = 2
+    def _write(self, sheet_name: str, headings: list, data: dict, idempotency_key: str = None) -> int:
+        """Append one row (plus headings on an empty sheet); returns the row number, raises HttpError
+        
+        With an ``idempotency_key`` the key is stored in the ``outbox_key``
+        column, and a row whose key is already there is not appended again
+        (an earlier attempt succeeded but its response was lost).
+        """
+        sheet = self.service.spreadsheets()
+        
+        # Get existing data to find the next available row
+        result = sheet.values().get(
+            spreadsheetId=self.spreadsheet_id,
+            range=sheet_name
+        ).execute()
+        
+        existing_values = result.get('values', [])
+        header = existing_values[0] if existing_values else list(headings)
+        
+        # Prepare data row based on headings order
+        data_row = [data.get(heading, "") for heading in headings]
+        
+        if idempotency_key:
+            if KEY_COLUMN in header:
+                key_column = header.index(KEY_COLUMN)
+                for row_number, row in enumerate(existing_values[1:], start=2):
+                    if len(row) > key_column and row[key_column] == idempotency_key:
+                        return row_number  # Already written by an earlier attempt
             else:
-                next_row = len(existing_values) + 1
-            
-            # Prepare data row based on headings order
-            data_row = [data.get(heading, "") for heading in headings]
-            
-            # Write data to the next available row
-            data_body = {'values': [data_row]}
-            result = sheet.values().append(
+                key_column = max(len(header), len(headings))
+                if existing_values:
+                    # Sheet predates the key column - add its heading
+                    sheet.values().update(
+                        spreadsheetId=self.spreadsheet_id,
+                        range=f"{sheet_name}!{_column_letter(key_column)}1",
+                        valueInputOption="RAW",
+                        body={'values': [[KEY_COLUMN]]}
+                    ).execute()
+                else:
+                    header = header + [""] * (key_column - len(header)) + [KEY_COLUMN]
+            data_row += [""] * (key_column + 1 - len(data_row))
+            data_row[key_column] = idempotency_key
+        
+        # If no data exists, write headings first
+        if not existing_values:
+            headings_body = {'values': [header]}
+            sheet.values().append(
                 spreadsheetId=self.spreadsheet_id,
-                range=f"{sheet_name}!A{next_row}",
+                range=sheet_name,
                 valueInputOption="RAW",
-                body=data_body
+                body=headings_body
             ).execute()
-            
+            next_row = 2
+        else:
+            next_row = len(existing_values) + 1
+        
+        # Write data to the next available row
+        data_body = {'values': [data_row]}
+        result = sheet.values().append(
+            spreadsheetId=self.spreadsheet_id,
+            range=f"{sheet_name}!A{next_row}",
+            valueInputOption="RAW",
+            body=data_body
+        ).execute()
+        
+        return next_row
+
+    def deliver_payload(self, payload: dict) -> None:
+        """Outbox drainer entry point"""
+        self._write(**payload)
+
+    def _run(self, sheet_name: str, headings: list, data: dict) -> str:
+        if self.outbox is not None:
+            # Write-behind: the outbox drainer appends the row in the background
+            payload = {"sheet_name": sheet_name, "headings": headings, "data": data}
+            # One key per distinct write in a run: a corrected second write is
+            # queued, an exact repeat of the same call is not
+            digest = hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+            payload["idempotency_key"] = f"sheets:{self.run_id or uuid.uuid4().hex}:{digest[:16]}"
+            outbox_id = self.outbox.enqueue("sheets", payload, idempotency_key=payload["idempotency_key"])
+            return f"Queued data for {sheet_name} (outbox #{outbox_id}); not yet confirmed as written."
+        
+        try:
+            next_row = self._write(sheet_name, headings, data)
             return f"Successfully wrote data to row {next_row} in {sheet_name}."
         except HttpError as err:
             return f"An error occurred: {err}"
@@ -0,0 +1,193 @@
+# crewai_modules/streaming.py
+"""
+Token streaming for headline generation.
+
+``HeadlineStreamParser`` consumes LLM tokens incrementally and reports the
+``HEADLINE:`` line and each ``KEY POINTS`` bullet as soon as its line is
+complete. ``LLMTokenRouter`` subscribes once to crewai's event bus and routes
+stream chunks to whoever registered for that particular LLM instance - every
+agent pool member has its own LLM, so concurrent streams never mix.
+
+The event bus (``LLMStreamChunkEvent``) ships with crewai 0.108 and later;
+requirements.txt pins 0.130, which runs handlers synchronously on the thread
+that called the LLM, so chunks arrive in order. The router checks this and
+drops (with a warning) any chunk delivered from another thread rather than
+feed the parser out of order.
+"""
+import re
+import threading
+from contextlib import contextmanager
+
+try:
+    from crewai.events import crewai_event_bus, LLMStreamChunkEvent, LLMCallCompletedEvent
+except ImportError:
+    try:
+        from crewai.utilities.events import crewai_event_bus, LLMStreamChunkEvent, LLMCallCompletedEvent
+    except ImportError:
+        # crewai < 0.108 has no event bus: streaming degrades to the final result only
+        crewai_event_bus = LLMStreamChunkEvent = LLMCallCompletedEvent = None
+
+
+BULLETS = ("•", "-", "*")
+HEADLINE_RE = re.compile(r"^[#*\s]*headline\s*\**\s*:\s*\**\s*(.*)$", re.IGNORECASE)
+KEY_POINTS_RE = re.compile(r"^[#*\s]*key points\b", re.IGNORECASE)
+FINAL_ANSWER_RE = re.compile(r"^final answer\s*:\s*", re.IGNORECASE)
+REACT_STEP_RE = re.compile(r"^(?:thought|action|action input|observation)\s*:", re.IGNORECASE)
+
+
+class HeadlineStreamParser:
+    """Incremental counterpart of HeadlineGenerator._parse_output
+
+    ``feed()`` and ``close()`` return a list of ``(event, value)`` tuples where
+    event is ``"headline"`` or ``"key_point"``. Only the first headline and the
+    first KEY POINTS section are reported; the final result carries the
+    authoritative parse.
+
+    A segment (one LLM call) that contains ReAct steps (``Thought:``,
+    ``Action:``...) only counts from its ``Final Answer:`` on, so a draft
+    headline written while the agent is still using tools is never reported.
+    A KEY POINTS section that is still open when a segment ends carries on in
+    the next one.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._section = None
+        self._react = False  # Current segment is a ReAct step
+        self._final = False  # Current segment reached its Final Answer
+        self.headline = ""
+        self.key_points = []
+        self.done = False
+
+    def feed(self, text):
+        self._buffer += text
+        events = []
+        while "\n" in self._buffer:
+            line, self._buffer = self._buffer.split("\n", 1)
+            events.extend(self._line(line))
+        return events
+
+    def end_segment(self):
+        """One LLM call finished: flush its last line and start a fresh segment"""
+        events = self._flush()
+        self._react = self._final = False
+        return events
+
+    def close(self):
+        events = self.end_segment()
+        self.done = True
+        return events
+
+    def _flush(self):
+        line, self._buffer = self._buffer, ""
+        return self._line(line) if line.strip() else []
+
+    def _line(self, raw):
+        line = raw.strip()
+        if not line or self.done:
+            return []
+
+        final = FINAL_ANSWER_RE.match(line)
+        if final:
+            self._final = True
+            line = line[final.end():].strip()
+            if not line:
+                return []
+        elif not self._final and REACT_STEP_RE.match(line):
+            self._react = True
+        if self._react and not self._final:
+            return []  # Tool-use step - wait for its Final Answer
+
+        match = HEADLINE_RE.match(line)
+        if match:
+            if self._section == "key_points" and self.key_points:
+                self.done = True  # A second headline block starts - ignore it
+                return []
+            self._section = "headline"
+            value = match.group(1).strip().strip("*").strip()
+            if value and not self.headline:
+                self.headline = value
+                return [("headline", value)]
+            return []
+
+        if KEY_POINTS_RE.match(line):
+            self._section = "key_points"
+            return []
+
+        if self._section == "key_points":
+            if line.startswith(BULLETS):
+                point = line[1:].strip()
+                if point:
+                    self.key_points.append(point)
+                    return [("key_point", point)]
+                return []
+            if self.key_points:
+                self.done = True  # Section ended with a non-bullet line
+            return []
+
+        if self._section == "headline" and not self.headline:
+            # "HEADLINE:" on its own line - the next line is the headline
+            self.headline = line.strip("*").strip()
+            return [("headline", self.headline)]
+
+        return []
+
+
+class LLMTokenRouter:
+    """Routes crewai LLM stream events to per-LLM callbacks"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._callbacks = {}
+        self._registered = False
+        self._warned_unordered = False
+
+    @property
+    def available(self):
+        return crewai_event_bus is not None
+
+    def _register_handlers(self):
+        with self._lock:
+            if self._registered or not self.available:
+                return
+            self._registered = True
+
+        @crewai_event_bus.on(LLMStreamChunkEvent)
+        def on_chunk(source, event):
+            self._dispatch(source, event.chunk)
+
+        @crewai_event_bus.on(LLMCallCompletedEvent)
+        def on_call_completed(source, event):
+            self._dispatch(source, None)  # Segment boundary
+
+    def _dispatch(self, source, chunk):
+        entry = self._callbacks.get(id(source))
+        if not entry:
+            return
+        thread_id, callback = entry
+        if threading.get_ident() != thread_id:
+            # Handler runs off the LLM thread, so chunk order is not guaranteed
+            if not self._warned_unordered:
+                self._warned_unordered = True
+                print("⚠️ crewai delivers LLM stream events on another thread; "
+                      "token streaming is disabled and only the final result is sent")
+            return
+        callback(chunk)
+
+    @contextmanager
+    def subscribe(self, llm, callback):
+        """Send ``llm``'s chunks to ``callback(text)``; ``callback(None)`` marks the end of a call
+
+        Enter this on the thread that runs the LLM (the crew's kickoff thread).
+        """
+        self._register_handlers()
+        with self._lock:
+            self._callbacks[id(llm)] = (threading.get_ident(), callback)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._callbacks.pop(id(llm), None)
+
+
+token_router = LLMTokenRouter()
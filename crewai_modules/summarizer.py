@@ -12,19 +12,25 @@ class Summarizer(BaseTool):
     name: str = "Summarizer Tool"
     description: str = "Summarizes the given text."
     args_schema = SummarizerInput
+    client: object = None  # Optional shared Groq client
+    cache: object = None   # Optional LLMCache
 
     def _run(self, text: str) -> str:
-        groq = Groq(api_key=os.environ.get("GROQ_API_KEY"))
-        response = groq.chat.completions.create(
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that summarizes tsext concisely."},
-                {"role": "user", "content": f"Please summarize the following text:\n\n{text}"}
-            ],
-            model="llama-3.1-8b-instant",
-            max_tokens=600,
-            temperature=0.7
-        )
-        return response.choices[0].message.content
+        groq = self.client or Groq(api_key=os.environ.get("GROQ_API_KEY"))
+        model = "llama-3.1-8b-instant"
+        params = {"max_tokens": 600, "temperature": 0.7}
+        messages = [
+            {"role": "system", "content": "You are a helpful assistant that summarizes tsext concisely."},
+            {"role": "user", "content": f"Please summarize the following text:\n\n{text}"}
+        ]
+
+        def complete():
+            response = groq.chat.completions.create(messages=messages, model=model, **params)
+            return response.choices[0].message.content
+
+        if self.cache is not None:
+            return self.cache.cached_call(model, params, messages, complete)
+        return complete()
 
     async def _arun(self, text: str) -> str:
         raise NotImplementedError("Async not supported")
\ No newline at end of file
@@ -0,0 +1,58 @@
+# export_headlines.py - Nightly/bulk export of the headline history from Google Sheets
+"""
+Usage:
+    python export_headlines.py --format ndjson --output headlines.ndjson
+    python export_headlines.py --format csv --start-row 1201 --date-from 2026-10-01 --topic climate
+"""
+import argparse
+import os
+import sys
+
+from crewai_modules.sheet_exporter import SheetExporter, FORMATS, check_date, parquet_available
+
+
+def iso_date(value):
+    try:
+        return check_date(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream the headline history out of Google Sheets")
+    parser.add_argument("--format", choices=list(FORMATS), default="ndjson")
+    parser.add_argument("--sheet", default=None, help="Sheet name (default: EXPORT_SHEET_NAME or Sheet1)")
+    parser.add_argument("--start-row", type=int, default=2, help="Resume from this sheet row (row 1 holds headings)")
+    parser.add_argument("--date-from", type=iso_date, help="Only rows dated on or after YYYY-MM-DD")
+    parser.add_argument("--date-to", type=iso_date, help="Only rows dated on or before YYYY-MM-DD")
+    parser.add_argument("--topic", help="Only rows whose topic contains this text")
+    parser.add_argument("--page-size", type=int, default=None, help="Rows per range read")
+    parser.add_argument("--output", "-o", help="Output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    if args.format == "parquet" and not parquet_available():
+        parser.error("Parquet export requires pyarrow (pip install pyarrow)")
+
+    sheet_name = args.sheet or os.getenv("EXPORT_SHEET_NAME", "Sheet1")
+
+    exporter = SheetExporter(page_size=args.page_size)
+    chunks = exporter.export(args.format, sheet_name, start_row=args.start_row,
+                             date_from=args.date_from, date_to=args.date_to, topic=args.topic)
+
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    written = 0
+    try:
+        for chunk in chunks:
+            out.write(chunk)
+            written += len(chunk)
+    finally:
+        if args.output:
+            out.close()
+
+    print(f"📤 Exported {written} bytes from '{sheet_name}' as {args.format}", file=sys.stderr)
+    if exporter.last_row:
+        print(f"⏭️ Next run can resume with --start-row {exporter.last_row + 1}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
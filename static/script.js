@@ -50,9 +50,9 @@ document.addEventListener("DOMContentLoaded", function () {
     showLoadingModal();
 
     try {
-      console.log("Sending request for topic:", topic);
+      console.log("Sending streaming request for topic:", topic);
 
-      const response = await fetch("/api/generate", {
+      const response = await fetch("/api/generate/stream", {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -66,14 +66,33 @@ document.addEventListener("DOMContentLoaded", function () {
         throw new Error(`HTTP error! status: ${response.status}`);
       }
 
-      const data = await response.json();
-      console.log("Response data:", data);
-
-      // Simulate agent steps
-      simulateAgentSteps(() => {
-        hideLoadingModal();
-        displayResult(data, topic);
+      // Render the headline and key points as soon as the server parses them
+      let streamingStarted = false;
+      let finished = false;
+      await readEventStream(response, (event, data) => {
+        if (event === "headline" || event === "key_point") {
+          if (!streamingStarted) {
+            streamingStarted = true;
+            hideLoadingModal();
+            showStreamingResult(topic);
+          }
+          if (event === "headline") {
+            updateStreamingHeadline(data.value);
+          } else {
+            appendStreamingKeyPoint(data.value);
+          }
+        } else if (event === "result" || event === "error") {
+          finished = true;
+          console.log("Response data:", data);
+          hideLoadingModal();
+          displayResult(data, topic);
+        }
       });
+
+      // Proxy cut-off or worker crash: the stream ended without a final event
+      if (!finished) {
+        throw new Error("The connection closed before the headline was finished");
+      }
     } catch (error) {
       console.error("Error:", error);
       hideLoadingModal();
@@ -85,6 +104,86 @@ document.addEventListener("DOMContentLoaded", function () {
     }
   }
 
+  // ============================================================================
+  // STREAMING FUNCTIONS
+  // ============================================================================
+
+  async function readEventStream(response, onEvent) {
+    // Minimal Server-Sent Events reader for a fetch() response body
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+
+    while (true) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+
+      let boundary;
+      while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+        const block = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+
+        let event = "message";
+        let data = "";
+        block.split("\n").forEach((line) => {
+          if (line.startsWith("event:")) event = line.slice(6).trim();
+          else if (line.startsWith("data:")) data += line.slice(5).trim();
+        });
+        if (data) onEvent(event, JSON.parse(data));
+      }
+    }
+  }
+
+  function showStreamingResult(topic) {
+    resultsContainer.innerHTML = `
+            <div class="headline-result">
+                <div class="result-header">
+                    <div class="topic-display">
+                        <i class="fas fa-bullseye"></i>
+                        <h3 id="streamingTopic"></h3>
+                    </div>
+                    <div class="status-badges">
+                        <span class="status-badge status-info">
+                            <i class="fas fa-spinner fa-spin"></i> Writing...
+                        </span>
+                    </div>
+                </div>
+                <div class="headline-display-section">
+                    <div class="headline-wrapper">
+                        <i class="fas fa-quote-left quote-icon left"></i>
+                        <h2 class="headline-text" id="streamingHeadline"></h2>
+                        <i class="fas fa-quote-right quote-icon right"></i>
+                    </div>
+                    <div class="key-points-card">
+                        <div class="key-points-header">
+                            <i class="fas fa-key"></i>
+                            <h4>Key Information</h4>
+                        </div>
+                        <div class="key-points-list" id="streamingKeyPoints"></div>
+                    </div>
+                </div>
+            </div>
+        `;
+    document.getElementById("streamingTopic").textContent = topic;
+  }
+
+  function updateStreamingHeadline(headline) {
+    const element = document.getElementById("streamingHeadline");
+    if (element) element.textContent = headline;
+  }
+
+  function appendStreamingKeyPoint(point) {
+    const list = document.getElementById("streamingKeyPoints");
+    if (!list) return;
+
+    const item = document.createElement("div");
+    item.className = "key-point-item";
+    item.innerHTML = '<i class="fas fa-chevron-right"></i><span></span>';
+    item.querySelector("span").textContent = point;
+    list.appendChild(item);
+  }
+
   // ============================================================================
   // CRON JOB FUNCTIONS
   // ============================================================================
@@ -238,10 +337,6 @@ document.addEventListener("DOMContentLoaded", function () {
     });
   }
 
-  function simulateAgentSteps(callback) {
-    setTimeout(callback, 5000); // Simulate processing time
-  }
-
   function displayResult(data, topic) {
     console.log("Displaying result:", data);
 
@@ -308,6 +403,13 @@ document.addEventListener("DOMContentLoaded", function () {
     const slackSuccess =
       data.slack_status === "Sent" ||
       data.slack_status?.toLowerCase().includes("success");
+    const slackLabel = slackSuccess
+      ? "Sent to Slack"
+      : data.slack_status === "Queued"
+        ? "Queued for Slack"
+        : data.slack_status === "Failed"
+          ? "Slack Failed"
+          : "Slack Pending";
 
     return `
             <div class="headline-result">
@@ -322,7 +424,7 @@ document.addEventListener("DOMContentLoaded", function () {
                             <i class="fas fa-check-circle"></i> Generated
                         </span>
                         <span class="status-badge ${slackSuccess ? "status-success" : "status-info"}">
-                            <i class="fab fa-slack"></i> ${slackSuccess ? "Sent to Slack" : "Slack Pending"}
+                            <i class="fab fa-slack"></i> ${slackLabel}
                         </span>
                         <span class="status-badge status-info">
                             <i class="fas fa-save"></i> Saved to Sheets
@@ -0,0 +1,122 @@
+# tests/test_agent_pool.py
+import threading
+import time
+
+import pytest
+
+from crewai_modules.agent_pool import AgentPool, PoolExhaustedError, SharedClients
+
+
+class Member:
+    def __init__(self, number):
+        self.number = number
+        self.healthy = True
+
+
+def make_pool(size=1, **kwargs):
+    built = []
+
+    def factory():
+        member = Member(len(built) + 1)
+        built.append(member)
+        return member
+
+    pool = AgentPool(factory, size=size, health_check=lambda m: m.healthy, **kwargs)
+    return pool, built
+
+
+def test_checkout_reuses_idle_member():
+    pool, built = make_pool(size=2)
+    with pool.checkout() as first:
+        pass
+    with pool.checkout() as second:
+        pass
+    assert first is second
+    assert len(built) == 1
+    assert pool.stats()["idle"] == 1
+
+
+def test_checkout_times_out_when_exhausted():
+    pool, _ = make_pool(size=1)
+    with pool.checkout():
+        start = time.monotonic()
+        with pytest.raises(PoolExhaustedError):
+            pool.acquire(timeout=0.2)
+        assert time.monotonic() - start < 2
+
+
+def test_discard_wakes_waiter():
+    pool, built = make_pool(size=1, checkout_timeout=10)
+    holding = threading.Event()
+    waited = []
+
+    def holder():
+        try:
+            with pool.checkout():
+                holding.set()
+                time.sleep(0.2)
+                raise RuntimeError("crew failed")
+        except RuntimeError:
+            pass
+
+    def waiter():
+        holding.wait()
+        start = time.monotonic()
+        with pool.checkout() as member:
+            waited.append((time.monotonic() - start, member))
+
+    threads = [threading.Thread(target=holder), threading.Thread(target=waiter)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    elapsed, member = waited[0]
+    assert elapsed < 2  # Not the 10s checkout timeout
+    assert member is built[1]  # The failed member was replaced
+    assert pool.stats()["discarded"] == 1
+
+
+def test_unhealthy_member_is_rebuilt_on_checkout():
+    pool, built = make_pool(size=1)
+    pool.warm(1)
+    built[0].healthy = False
+    with pool.checkout() as member:
+        assert member is built[1]
+    stats = pool.stats()
+    assert stats["created"] == 1
+    assert stats["discarded"] == 1
+
+
+def test_unhealthy_member_is_discarded_on_release():
+    pool, built = make_pool(size=1)
+    with pool.checkout() as member:
+        member.healthy = False
+    assert pool.stats()["idle"] == 0
+    assert pool.stats()["created"] == 0
+    with pool.checkout() as member:
+        assert member is built[1]
+
+
+def test_factory_failure_releases_capacity():
+    calls = []
+
+    def factory():
+        calls.append(1)
+        if len(calls) == 1:
+            raise OSError("credentials unavailable")
+        return Member(len(calls))
+
+    pool = AgentPool(factory, size=1)
+    with pytest.raises(OSError):
+        pool.acquire(timeout=0.1)
+    assert pool.stats()["created"] == 0
+    with pool.checkout(timeout=0.1) as member:
+        assert member.number == 2
+
+
+def test_http_sessions_are_separate_but_share_connections():
+    clients = SharedClients()
+    first, second = clients.http_session(), clients.http_session()
+    assert first is not second
+    assert first.get_adapter("https://example.com") is second.get_adapter("https://example.com")
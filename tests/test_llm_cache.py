@@ -0,0 +1,202 @@
+# tests/test_llm_cache.py
+import importlib.util
+import os
+import sys
+import time
+import types
+from unittest import mock
+
+import pytest
+
+
+class StubLLM:
+    """Minimal stand-in for crewai.LLM: records calls and returns ``reply``"""
+
+    reply = "stub response"
+
+    def __init__(self, model, temperature=None, **kwargs):
+        self.model = model
+        self.temperature = temperature
+        self.calls = 0
+
+    def call(self, messages, *args, **kwargs):
+        self.calls += 1
+        return self.reply
+
+
+def load_llm_cache():
+    # Import the module against the stub so no provider client is needed
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "crewai_modules", "llm_cache.py")
+    spec = importlib.util.spec_from_file_location("llm_cache_under_test", path)
+    module = importlib.util.module_from_spec(spec)
+    with mock.patch.dict(sys.modules, {"crewai": types.SimpleNamespace(LLM=StubLLM)}):
+        spec.loader.exec_module(module)
+    return module
+
+
+llm_cache = load_llm_cache()
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "llm_cache.db")
+
+
+class Provider:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.responses.pop(0) if self.responses else "response"
+
+
+# ----------------------------------------------------------------------
+# Canonicalization
+# ----------------------------------------------------------------------
+
+def test_whitespace_does_not_change_the_key():
+    a = [{"role": "user", "content": "Research  'AI'.\n        Find sources."}]
+    b = [{"role": "user", "content": "Research 'AI'. Find sources."}]
+    assert llm_cache.make_key("m", {}, a) == llm_cache.make_key("m", {}, b)
+    assert llm_cache.make_key("m", {}, "Research 'AI'. Find sources.") == llm_cache.make_key("m", {}, b)
+
+
+def test_params_and_model_change_the_key():
+    messages = [{"role": "user", "content": "hi"}]
+    assert llm_cache.make_key("m", {"temperature": 0.7}, messages) != llm_cache.make_key("m", {"temperature": 0.2}, messages)
+    assert llm_cache.make_key("m", {}, messages) != llm_cache.make_key("other", {}, messages)
+    # Unset params are ignored
+    assert llm_cache.make_key("m", {"top_p": None}, messages) == llm_cache.make_key("m", {}, messages)
+
+
+def tool_exchange(call_id, arguments):
+    return [
+        {"role": "assistant", "content": "", "tool_calls": [
+            {"id": call_id, "type": "function", "function": {"name": "search", "arguments": arguments}}
+        ]},
+        {"role": "tool", "tool_call_id": call_id, "content": "results"},
+    ]
+
+
+def test_tool_call_ids_are_renumbered():
+    canonical = llm_cache.canonicalize_messages(tool_exchange("call_abc", '{"query": "ai"}'))
+    assert canonical[0]["tool_calls"] == [
+        {"id": "call_0", "type": "function", "name": "search", "arguments": {"query": "ai"}}
+    ]
+    assert canonical[1]["tool_call_id"] == "call_0"
+    # Provider-generated ids and argument key order do not matter
+    assert (llm_cache.make_key("m", {}, tool_exchange("call_abc", '{"a": 1, "b": 2}'))
+            == llm_cache.make_key("m", {}, tool_exchange("call_xyz", '{"b": 2, "a": 1}')))
+
+
+def test_tool_call_arguments_change_the_key():
+    assert (llm_cache.make_key("m", {}, tool_exchange("call_abc", '{"query": "ai"}'))
+            != llm_cache.make_key("m", {}, tool_exchange("call_abc", '{"query": "space"}')))
+
+
+# ----------------------------------------------------------------------
+# Modes and eviction
+# ----------------------------------------------------------------------
+
+def test_on_mode_serves_hits(cache_path):
+    cache = llm_cache.LLMCache(path=cache_path, mode="on")
+    provider = Provider("first")
+    assert cache.cached_call("m", {}, "prompt", provider) == "first"
+    assert cache.cached_call("m", {}, "prompt", provider) == "first"
+    assert provider.calls == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_empty_responses_are_not_stored(cache_path):
+    cache = llm_cache.LLMCache(path=cache_path, mode="on")
+    provider = Provider("  \n", "real")
+    assert cache.cached_call("m", {}, "prompt", provider) == "  \n"
+    assert cache.cached_call("m", {}, "prompt", provider) == "real"
+    assert provider.calls == 2
+
+
+def test_ttl_expires_entries(cache_path):
+    cache = llm_cache.LLMCache(path=cache_path, mode="on", ttl_hours=0.01 / 3600)
+    provider = Provider("old", "new")
+    cache.cached_call("m", {}, "prompt", provider)
+    time.sleep(0.05)
+    assert cache.cached_call("m", {}, "prompt", provider) == "new"
+    assert provider.calls == 2
+
+
+def test_lru_eviction_keeps_recently_used(cache_path):
+    cache = llm_cache.LLMCache(path=cache_path, mode="on", max_mb=2500 / (1024 * 1024))
+    big = "x" * 1000
+    cache.cached_call("m", {}, "a", Provider(big))
+    cache.cached_call("m", {}, "b", Provider(big))
+    cache.cached_call("m", {}, "a", Provider())  # Touch "a"
+    cache.cached_call("m", {}, "c", Provider(big))  # Over budget - "b" goes
+    assert cache.get(llm_cache.make_key("m", {}, "a")) == big
+    assert cache.get(llm_cache.make_key("m", {}, "b")) is None
+    assert cache.get(llm_cache.make_key("m", {}, "c")) == big
+
+
+def test_recorded_fixtures_survive_eviction(cache_path):
+    recorder = llm_cache.LLMCache(path=cache_path, mode="record", ttl_hours=0.01 / 3600,
+                                  max_mb=1500 / (1024 * 1024))
+    fixture = "f" * 1000
+    recorder.cached_call("m", {}, "fixture", Provider(fixture))
+    time.sleep(0.05)
+    recorder.cached_call("m", {}, "second fixture", Provider(fixture))
+    # A later "on" run adds ordinary entries past the TTL and the size budget
+    cache = llm_cache.LLMCache(path=cache_path, mode="on", ttl_hours=0.01 / 3600,
+                               max_mb=1500 / (1024 * 1024))
+    cache.cached_call("m", {}, "ordinary", Provider("o" * 1000))
+    time.sleep(0.05)
+    cache.cached_call("m", {}, "ordinary 2", Provider("o" * 1000))
+
+    replay = llm_cache.LLMCache(path=cache_path, mode="replay")
+    assert replay.cached_call("m", {}, "fixture", Provider()) == fixture
+    assert replay.cached_call("m", {}, "second fixture", Provider()) == fixture
+    assert replay.get(llm_cache.make_key("m", {}, "ordinary")) is None
+
+
+def test_record_mode_always_calls_and_overwrites(cache_path):
+    cache = llm_cache.LLMCache(path=cache_path, mode="record")
+    provider = Provider("v1", "v2")
+    cache.cached_call("m", {}, "prompt", provider)
+    cache.cached_call("m", {}, "prompt", provider)
+    assert provider.calls == 2
+    assert cache.get(llm_cache.make_key("m", {}, "prompt")) == "v2"
+
+
+def test_replay_miss_raises_without_calling(cache_path):
+    cache = llm_cache.LLMCache(path=cache_path, mode="replay")
+    provider = Provider()
+    with pytest.raises(llm_cache.CacheMissError):
+        cache.cached_call("m", {}, "never recorded", provider)
+    assert provider.calls == 0
+
+
+def test_off_mode_bypasses_the_cache(cache_path):
+    cache = llm_cache.LLMCache(path=cache_path, mode="off")
+    provider = Provider("a", "b")
+    assert cache.cached_call("m", {}, "prompt", provider) == "a"
+    assert cache.cached_call("m", {}, "prompt", provider) == "b"
+    assert not os.path.exists(cache_path)
+
+
+def test_invalid_mode_is_rejected(cache_path):
+    with pytest.raises(ValueError):
+        llm_cache.LLMCache(path=cache_path, mode="sometimes")
+
+
+def test_cached_llm_goes_through_the_cache(cache_path):
+    cache = llm_cache.LLMCache(path=cache_path, mode="on")
+    llm = llm_cache.CachedLLM(model="gemini-test", temperature=0.7, cache=cache)
+    messages = [{"role": "user", "content": "Write a headline"}]
+    assert llm.call(messages) == StubLLM.reply
+    assert llm.call(messages) == StubLLM.reply
+    assert llm.calls == 1
+    # Different sampling parameters are a different entry
+    other = llm_cache.CachedLLM(model="gemini-test", temperature=0.1, cache=cache)
+    other.call(messages)
+    assert other.calls == 1
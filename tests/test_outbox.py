@@ -0,0 +1,142 @@
+# tests/test_outbox.py
+import time
+
+import pytest
+
+from crewai_modules.outbox import Outbox
+
+
+class Recorder:
+    """deliver() that records payloads and fails while ``failures`` is positive"""
+
+    def __init__(self, failures=0, error="service down"):
+        self.delivered = []
+        self.failures = failures
+        self.error = error
+
+    def __call__(self, payload):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError(self.error)
+        self.delivered.append(payload["n"])
+
+
+@pytest.fixture
+def outbox_path(tmp_path):
+    return str(tmp_path / "outbox.db")
+
+
+def make_outbox(path, deliver, **kwargs):
+    outbox = Outbox(path=path, base_backoff=0.05, max_backoff=0.2, **kwargs)
+    outbox.register("test", deliver)
+    return outbox
+
+
+def test_delivers_in_enqueue_order(outbox_path):
+    recorder = Recorder()
+    outbox = make_outbox(outbox_path, recorder)
+    for n in range(5):
+        outbox.enqueue("test", {"n": n})
+    assert outbox.drain_once("test") == 5
+    assert recorder.delivered == [0, 1, 2, 3, 4]
+    assert outbox.metrics()["channels"]["test"]["delivered"] == 5
+
+
+def test_rows_survive_a_restart_and_replay_in_order(outbox_path):
+    first = make_outbox(outbox_path, Recorder(failures=100))
+    for n in range(3):
+        first.enqueue("test", {"n": n})
+    first.drain_once("test")
+    first.stop()
+
+    recorder = Recorder()
+    second = make_outbox(outbox_path, recorder)
+    second.flush(timeout=2)
+    assert recorder.delivered == [0, 1, 2]
+
+
+def test_failed_head_blocks_later_rows_and_backs_off(outbox_path):
+    recorder = Recorder(failures=1)
+    outbox = make_outbox(outbox_path, recorder)
+    outbox.enqueue("test", {"n": 1})
+    outbox.enqueue("test", {"n": 2})
+
+    assert outbox.drain_once("test") == 0
+    assert recorder.delivered == []
+    # Still backing off - nothing is retried yet
+    assert outbox.drain_once("test") == 0
+    assert outbox.metrics()["channels"]["test"]["retrying"] == 1
+
+    time.sleep(0.1)
+    assert outbox.drain_once("test") == 2
+    assert recorder.delivered == [1, 2]
+
+
+def test_row_is_dead_after_max_attempts(outbox_path):
+    recorder = Recorder(failures=2)
+    outbox = make_outbox(outbox_path, recorder, max_attempts=2)
+    outbox.enqueue("test", {"n": 1})
+    outbox.enqueue("test", {"n": 2})
+
+    outbox.drain_once("test", force=True)
+    outbox.drain_once("test", force=True)
+    stats = outbox.metrics()["channels"]["test"]
+    assert stats["dead"] == 1
+    assert recorder.delivered == [2]  # The dead row no longer blocks the queue
+
+    assert outbox.retry_dead("test") == 1
+    outbox.drain_once("test", force=True)
+    assert recorder.delivered == [2, 1]
+
+
+def test_duplicate_key_is_queued_once(outbox_path):
+    recorder = Recorder()
+    outbox = make_outbox(outbox_path, recorder)
+    first = outbox.enqueue("test", {"n": 1}, idempotency_key="run-1")
+    again = outbox.enqueue("test", {"n": 1}, idempotency_key="run-1")
+    other = outbox.enqueue("test", {"n": 1}, idempotency_key="run-2")
+    assert first == again != other
+    outbox.drain_once("test")
+    assert recorder.delivered == [1, 1]
+    # Still a no-op once delivered
+    outbox.enqueue("test", {"n": 1}, idempotency_key="run-1")
+    assert outbox.drain_once("test") == 0
+
+
+def test_lease_keeps_a_second_drainer_out_until_handover(outbox_path):
+    first_recorder, second_recorder = Recorder(), Recorder()
+    first = make_outbox(outbox_path, first_recorder)
+    second = make_outbox(outbox_path, second_recorder)
+    first.enqueue("test", {"n": 1})
+    assert first.drain_once("test") == 1
+
+    second.enqueue("test", {"n": 2})
+    assert second.drain_once("test") == 0  # first still holds the lease
+    first.stop()  # Releases the lease
+    assert second.drain_once("test") == 1
+    assert first_recorder.delivered == [1]
+    assert second_recorder.delivered == [2]
+
+
+def test_expired_lease_is_taken_over(outbox_path):
+    first = make_outbox(outbox_path, Recorder(), lease_seconds=0.05)
+    recorder = Recorder()
+    second = make_outbox(outbox_path, recorder)
+    first.enqueue("test", {"n": 1})
+    first.drain_once("test")  # Takes the lease, never releases it
+    second.enqueue("test", {"n": 2})
+    time.sleep(0.1)
+    assert second.drain_once("test") == 1
+    assert recorder.delivered == [2]
+
+
+def test_metrics_report_the_most_recent_error(outbox_path):
+    recorder = Recorder(failures=1, error="zzz first failure")
+    outbox = make_outbox(outbox_path, recorder, max_attempts=1)
+    outbox.enqueue("test", {"n": 1})
+    outbox.drain_once("test")
+
+    recorder.failures, recorder.error = 1, "aaa latest failure"
+    outbox.enqueue("test", {"n": 2})
+    outbox.drain_once("test")
+    assert outbox.metrics()["channels"]["test"]["last_error"] == "aaa latest failure"
@@ -0,0 +1,146 @@
+# tests/test_sheet_exporter.py
+import csv
+import io
+import json
+import re
+
+import pytest
+
+pytest.importorskip("crewai")  # spreadsheet_writer, imported by the exporter, needs crewai
+pytest.importorskip("googleapiclient")
+
+from crewai_modules.sheet_exporter import MAX_PAGE_SIZE, SheetExporter, check_date  # noqa: E402
+
+
+class Request:
+    def __init__(self, result):
+        self.result = result
+
+    def execute(self):
+        return self.result
+
+
+class FakeSheets:
+    """In-memory stand-in for the Sheets v4 service used by SheetExporter
+
+    Like the real API, ranges come back with trailing empty rows left out,
+    and the grid can be larger than the data.
+    """
+
+    def __init__(self, rows, row_count=None):
+        self.rows = rows  # rows[0] is the header; sheet row n is rows[n - 1]
+        self.row_count = row_count or len(rows)
+        self.batch_calls = []
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def get(self, spreadsheetId, range=None, ranges=None, fields=None):
+        if ranges is not None:  # Spreadsheet metadata
+            return Request({"sheets": [{"properties": {"gridProperties": {"rowCount": self.row_count}}}]})
+        return Request({"values": self._read(range)})
+
+    def batchGet(self, spreadsheetId, ranges):
+        self.batch_calls.append(ranges)
+        return Request({"valueRanges": [{"range": r, "values": self._read(r)} for r in ranges]})
+
+    def _read(self, a1):
+        first, last = map(int, re.search(r"!(\d+):(\d+)$", a1).groups())
+        values = [list(row) for row in self.rows[first - 1:last]]
+        while values and not any(values[-1]):
+            values.pop()
+        return values
+
+
+HEADINGS = ["Date", "Topic", "Headline"]
+
+
+def history(count, gap_at=None):
+    rows = [HEADINGS]
+    for n in range(count):
+        day = 1 + n % 28
+        rows.append([f"2026-10-{day:02d} 09:00:00", "AI" if n % 2 else "Space", f"Headline {n}"])
+        if gap_at == n:
+            rows.append(["", "", ""])
+    return rows
+
+
+def make_exporter(service, page_size=3, pages_per_request=2):
+    return SheetExporter(service=service, spreadsheet_id="sheet-id", page_size=page_size,
+                         pages_per_request=pages_per_request)
+
+
+def ndjson(exporter, **kwargs):
+    body = b"".join(exporter.export("ndjson", "Headlines", **kwargs))
+    return [json.loads(line) for line in body.decode("utf-8").splitlines()]
+
+
+def test_pages_cover_every_row_across_batches():
+    service = FakeSheets(history(10), row_count=1000)
+    exporter = make_exporter(service)
+    records = ndjson(exporter)
+    assert [r["Headline"] for r in records] == [f"Headline {n}" for n in range(10)]
+    assert [r["_row"] for r in records] == list(range(2, 12))
+    # 3 rows per range, 2 ranges per batchGet
+    assert service.batch_calls[0] == ["'Headlines'!2:4", "'Headlines'!5:7"]
+    assert exporter.last_row == 11
+
+
+def test_reading_continues_past_empty_rows():
+    service = FakeSheets(history(10, gap_at=2), row_count=12)
+    records = ndjson(make_exporter(service, page_size=2, pages_per_request=1))
+    assert len(records) == 10
+    assert records[-1]["_row"] == 12
+    # Reading stops at the grid size rather than at the first empty range
+    assert service.batch_calls[-1] == ["'Headlines'!12:13"]
+
+
+def test_resume_from_last_row():
+    service = FakeSheets(history(10))
+    first = ndjson(make_exporter(service))
+    resumed = ndjson(make_exporter(service), start_row=first[4]["_row"] + 1)
+    assert resumed == first[5:]
+
+
+def test_date_and_topic_filters():
+    service = FakeSheets(history(10))
+    records = ndjson(make_exporter(service), date_from="2026-10-03", date_to="2026-10-08", topic="ai")
+    assert [r["Headline"] for r in records] == ["Headline 3", "Headline 5", "Headline 7"]
+    assert all(r["Topic"] == "AI" for r in records)
+
+
+def test_csv_writes_the_header_once():
+    service = FakeSheets(history(7))
+    body = b"".join(make_exporter(service, page_size=2).export("csv", "Headlines")).decode("utf-8")
+    rows = list(csv.reader(io.StringIO(body)))
+    assert rows[0] == ["_row"] + HEADINGS
+    assert len(rows) == 8
+
+
+def test_bad_arguments_fail_before_streaming():
+    exporter = make_exporter(FakeSheets(history(3)))
+    with pytest.raises(ValueError):
+        exporter.export("xml", "Headlines")
+    with pytest.raises(ValueError):
+        exporter.export("ndjson", "Headlines", date_from="2026-13-01")
+
+
+def test_check_date():
+    assert check_date("2026-10-19") == "2026-10-19"
+    for value in ["2026-02-30", "19/10/2026", "2026-10-19T09:00", "", None]:
+        with pytest.raises(ValueError):
+            check_date(value)
+
+
+@pytest.mark.parametrize("page_size", [0, -1, MAX_PAGE_SIZE + 1, "abc"])
+def test_page_size_out_of_range_is_rejected(page_size):
+    with pytest.raises(ValueError):
+        make_exporter(FakeSheets(history(1)), page_size=page_size)
+
+
+def test_page_size_from_query_string():
+    assert make_exporter(FakeSheets(history(1)), page_size="250").page_size == 250
+    assert make_exporter(FakeSheets(history(1)), page_size=MAX_PAGE_SIZE).page_size == MAX_PAGE_SIZE
@@ -0,0 +1,73 @@
+# tests/test_streaming.py
+import threading
+
+from crewai_modules.streaming import HeadlineStreamParser, LLMTokenRouter
+
+
+def run_parser(chunks):
+    """Feed chunks (None = end of an LLM call) and return every event"""
+    parser = HeadlineStreamParser()
+    events = []
+    for chunk in chunks:
+        events.extend(parser.feed(chunk) if chunk is not None else parser.end_segment())
+    events.extend(parser.close())
+    return events
+
+
+def test_headline_and_key_points_across_chunks():
+    events = run_parser(["HEAD", "LINE: Rockets ", "reach orbit\nKEY ", "POINTS:\n• fir", "st\n• second"])
+    assert events == [("headline", "Rockets reach orbit"), ("key_point", "first"), ("key_point", "second")]
+
+
+def test_key_points_continue_across_segments():
+    events = run_parser(["HEADLINE: X\n", None, "KEY POINTS:\n• a", None, "• b\n"])
+    assert events == [("headline", "X"), ("key_point", "a"), ("key_point", "b")]
+
+
+def test_headline_on_its_own_line():
+    events = run_parser(["**HEADLINE:**\n", "**Markets rally**\n", "KEY POINTS:\n- up 3%\n"])
+    assert events == [("headline", "Markets rally"), ("key_point", "up 3%")]
+
+
+def test_react_draft_is_ignored_until_final_answer():
+    events = run_parser([
+        "Thought: I should save a draft first\nHEADLINE: Draft headline\nKEY POINTS:\n• draft\n",
+        "Action: Spreadsheet Writer Tool\nAction Input: {\"headline\": \"Draft headline\"}\n",
+        None,
+        "Thought: I now know the final answer\nFinal Answer: HEADLINE: Final headline\n",
+        "KEY POINTS:\n• real point\n",
+        None,
+    ])
+    assert events == [("headline", "Final headline"), ("key_point", "real point")]
+
+
+def test_final_answer_on_its_own_line():
+    events = run_parser(["Thought: done\nFinal Answer:\nHEADLINE: Y\nKEY POINTS:\n• p\n"])
+    assert events == [("headline", "Y"), ("key_point", "p")]
+
+
+def test_only_first_block_is_reported():
+    events = run_parser([
+        "Final Answer: HEADLINE: First\nKEY POINTS:\n• one\n", None,
+        "Thought: send it to Slack\nAction: Slack Sender Tool\n", None,
+        "Final Answer: HEADLINE: First\nKEY POINTS:\n• one\n• again\n", None,
+    ])
+    assert events == [("headline", "First"), ("key_point", "one")]
+
+
+def test_section_ends_on_non_bullet_line():
+    events = run_parser(["HEADLINE: X\nKEY POINTS:\n• a\nSaved to the spreadsheet.\n• not a point\n"])
+    assert events == [("headline", "X"), ("key_point", "a")]
+
+
+def test_router_drops_chunks_from_another_thread():
+    router = LLMTokenRouter()
+    llm = object()
+    received = []
+    with router.subscribe(llm, received.append):
+        router._dispatch(llm, "same thread")
+        other = threading.Thread(target=router._dispatch, args=(llm, "other thread"))
+        other.start()
+        other.join()
+    router._dispatch(llm, "after unsubscribe")
+    assert received == ["same thread"]